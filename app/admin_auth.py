@@ -23,6 +23,8 @@ class AdminAuth:
     
     def login(self, username: str) -> None:
         """Set admin session"""
+        # Expire after PERMANENT_SESSION_LIFETIME rather than at browser close
+        session.permanent = True
         session['admin_logged_in'] = True
         session['admin_username'] = username
     
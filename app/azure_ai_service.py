@@ -6,11 +6,15 @@ import requests
 from typing import Dict, Tuple, Optional
 import json
 
+from app.http_client import SESSION
+
 class AzureAIService:
     """Service for Azure AI Foundry integration"""
     
-    def __init__(self, endpoint: str, api_key: str, deployment_name: str, api_version: str = '2024-02-15-preview'):
+    def __init__(self, endpoint: str, api_key: str, deployment_name: str, api_version: str = '2024-02-15-preview',
+                 session: requests.Session = None):
         self.endpoint = endpoint.rstrip('/')
+        self.session = session or SESSION
         self.api_key = api_key
         self.deployment_name = deployment_name
         self.api_version = api_version
@@ -50,7 +54,7 @@ class AzureAIService:
                 'temperature': temperature
             }
             
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
+            response = self.session.post(url, headers=headers, json=payload, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
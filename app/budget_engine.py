@@ -1,5 +1,8 @@
 from typing import Dict, List
 
+# Gap severities that count toward the SIEM recommendation
+_HIGH_SEVERITIES = frozenset(['High', 'Critical'])
+
 class BudgetEngine:
     """Calculates budget estimates for recommendations"""
     
@@ -79,7 +82,7 @@ class BudgetEngine:
                 budget['total_monthly'] += backup_monthly
         
         # Optional: SIEM for comprehensive monitoring (if multiple high-severity gaps)
-        high_severity_gaps = sum(1 for g in gaps if g['severity'] in ['High', 'Critical'])
+        high_severity_gaps = sum(1 for g in gaps if g['severity'] in _HIGH_SEVERITIES)
         if high_severity_gaps >= 3 and user_count > 0:
             siem_monthly = user_count * self.unit_costs['COST_SIEM_PER_USER']
             budget['services'].append({
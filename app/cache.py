@@ -0,0 +1,7 @@
+"""
+Application cache
+Flask-Caching instance shared by the route modules (Redis when REDIS_URL is set, else per-process SimpleCache)
+"""
+from flask_caching import Cache
+
+cache = Cache()
@@ -1,4 +1,5 @@
 import os
+from datetime import timedelta
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -10,9 +11,22 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key')
     FLASK_ENV = os.getenv('FLASK_ENV', 'development')
     
+    # Admin login lives in Flask's signed session cookie (no server-side store)
+    PERMANENT_SESSION_LIFETIME = timedelta(seconds=int(os.getenv('SESSION_LIFETIME_SECONDS', '3600')))
+    SESSION_COOKIE_HTTPONLY = True
+    SESSION_COOKIE_SAMESITE = 'Lax'
+    SESSION_COOKIE_SECURE = os.getenv('SESSION_COOKIE_SECURE', 'false').lower() == 'true'
+    
     # Database
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'postgresql://sbr_user:sbr_password@db:5432/sbr_db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_pre_ping': True,
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '20'))
+    }
+    
+    # Set once migrations/add_segment_mrr_trigger.sql has been applied
+    SEGMENT_MRR_TRIGGER = os.getenv('SEGMENT_MRR_TRIGGER', 'false').lower() == 'true'
     
     # HaloPSA
     HALO_API_URL = os.getenv('HALO_API_URL', 'https://your-halo-instance.halopsa.com/api')
@@ -21,6 +35,11 @@ class Config:
     HALO_CLIENT_SECRET = os.getenv('HALO_CLIENT_SECRET', '')
     USE_MOCK_DATA = os.getenv('USE_MOCK_DATA', 'true').lower() == 'true'
     
+    # Outbound HTTP (shared session for integrations)
+    HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '10'))
+    HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '20'))
+    HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', '3'))
+    
     # Unit Costs (Monthly)
     COST_MFA_PER_USER = float(os.getenv('COST_MFA_PER_USER', '3.00'))
     COST_EDR_PER_ENDPOINT = float(os.getenv('COST_EDR_PER_ENDPOINT', '5.50'))
@@ -35,4 +54,27 @@ class Config:
     
     # Reports
     REPORTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'reports')
+    JINJA_CACHE_DIR = os.getenv('JINJA_CACHE_DIR', '/tmp/sbr_jinja_cache')
+    PARALLEL_REPORT_RENDER = os.getenv('PARALLEL_REPORT_RENDER', 'false').lower() == 'true'
+    
+    # Report file offload to the reverse proxy
+    USE_X_SENDFILE = os.getenv('USE_X_SENDFILE', 'false').lower() == 'true'  # Apache / lighttpd
+    REPORTS_ACCEL_PREFIX = os.getenv('REPORTS_ACCEL_PREFIX', '')  # nginx, e.g. /internal/reports/
+    
+    # Analysis memoization (keyed on a hash of the fetched Halo payloads)
+    CACHE_DIR = os.getenv('CACHE_DIR', os.path.join(os.path.dirname(os.path.dirname(__file__)), 'cache'))
+    ANALYSIS_CACHE_TTL = int(os.getenv('ANALYSIS_CACHE_TTL', '86400'))
+    
+    # Response/data cache (Flask-Caching). Invalidation must reach every gunicorn
+    # worker and the RQ worker, so share Redis whenever it is configured
+    CACHE_TYPE = os.getenv('CACHE_TYPE', 'RedisCache' if os.getenv('REDIS_URL') else 'SimpleCache')
+    CACHE_DEFAULT_TIMEOUT = int(os.getenv('CACHE_DEFAULT_TIMEOUT', '60'))
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', os.getenv('REDIS_URL', 'redis://redis:6379/0'))
+    
+    # Background jobs (RQ)
+    REDIS_URL = os.getenv('REDIS_URL', 'redis://redis:6379/0')
+    RQ_QUEUE = os.getenv('RQ_QUEUE', 'reports')
+    ASYNC_REPORTS = os.getenv('ASYNC_REPORTS', 'false').lower() == 'true'
+    ASYNC_PDF = os.getenv('ASYNC_PDF', 'false').lower() == 'true'
+    REPORT_JOB_TIMEOUT = int(os.getenv('REPORT_JOB_TIMEOUT', '600'))
 
@@ -1,18 +1,37 @@
 import requests
-from typing import Dict, List, Optional
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import random
 
+# Ticket statuses that carry a resolution time
+_CLOSED_STATUSES = frozenset(['Resolved', 'Closed'])
+
 class HaloConnector:
     """Connects to HaloPSA API or provides mock data"""
     
-    def __init__(self, api_url: str, api_key: str, client_id: str, client_secret: str, use_mock: bool = True):
+    def __init__(self, api_url: str, api_key: str, client_id: str, client_secret: str, use_mock: bool = True,
+                 max_workers: int = 16):
         self.api_url = api_url
         self.api_key = api_key
         self.client_id = client_id
         self.client_secret = client_secret
         self.use_mock = use_mock
         self.access_token = None
+        self._token_expiry = 0.0
+        self._token_lock = threading.Lock()
+        
+        # Shared pool for overlapping the blocking Halo requests
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='halo')
+        
+        # Keep-alive connection pool sized to the executor so calls reuse TLS connections
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
     
     def _authenticate(self) -> bool:
         """Authenticate with HaloPSA and get access token"""
@@ -21,7 +40,7 @@ class HaloConnector:
         
         try:
             auth_url = f"{self.api_url}/token"
-            response = requests.post(
+            response = self._session.post(
                 auth_url,
                 data={
                     'grant_type': 'client_credentials',
@@ -31,12 +50,22 @@ class HaloConnector:
                 }
             )
             response.raise_for_status()
-            self.access_token = response.json().get('access_token')
+            payload = response.json()
+            self.access_token = payload.get('access_token')
+            self._token_expiry = time.monotonic() + float(payload.get('expires_in', 3600))
             return True
         except Exception as e:
             print(f"Authentication failed: {e}")
             return False
     
+    def _ensure_token(self):
+        """Authenticate if there is no token or it expires within the next minute"""
+        if self.access_token and time.monotonic() < self._token_expiry - 60:
+            return
+        with self._token_lock:
+            if not self.access_token or time.monotonic() >= self._token_expiry - 60:
+                self._authenticate()
+    
     def _get_headers(self) -> Dict:
         """Get request headers with authentication"""
         if self.use_mock:
@@ -52,11 +81,10 @@ class HaloConnector:
             return self._mock_customer(customer_id)
         
         try:
-            if not self.access_token:
-                self._authenticate()
+            self._ensure_token()
             
             url = f"{self.api_url}/customers/{customer_id}"
-            response = requests.get(url, headers=self._get_headers())
+            response = self._session.get(url, headers=self._get_headers())
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -69,12 +97,11 @@ class HaloConnector:
             return self._mock_assets(customer_id)
         
         try:
-            if not self.access_token:
-                self._authenticate()
+            self._ensure_token()
             
             url = f"{self.api_url}/assets"
             params = {'customerId': customer_id}
-            response = requests.get(url, headers=self._get_headers(), params=params)
+            response = self._session.get(url, headers=self._get_headers(), params=params)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -87,15 +114,14 @@ class HaloConnector:
             return self._mock_tickets(customer_id, days)
         
         try:
-            if not self.access_token:
-                self._authenticate()
+            self._ensure_token()
             
             url = f"{self.api_url}/tickets"
             params = {
                 'customerId': customer_id,
                 'startDate': (datetime.now() - timedelta(days=days)).isoformat()
             }
-            response = requests.get(url, headers=self._get_headers(), params=params)
+            response = self._session.get(url, headers=self._get_headers(), params=params)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -108,18 +134,48 @@ class HaloConnector:
             return self._mock_users(customer_id)
         
         try:
-            if not self.access_token:
-                self._authenticate()
+            self._ensure_token()
             
             url = f"{self.api_url}/users"
             params = {'customerId': customer_id}
-            response = requests.get(url, headers=self._get_headers(), params=params)
+            response = self._session.get(url, headers=self._get_headers(), params=params)
             response.raise_for_status()
             return response.json()
         except Exception as e:
             print(f"Failed to fetch users: {e}")
             return []
     
+    def get_customer_bundle(self, customer_id: str) -> Tuple[Optional[Dict], List[Dict], List[Dict], List[Dict]]:
+        """
+        Fetch customer, assets, tickets and users concurrently
+        
+        Returns:
+            Tuple of (customer, assets, tickets, users)
+        """
+        return self.get_customer_bundles([customer_id])[0]
+    
+    def get_customer_bundles(self, customer_ids: List[str]) -> List[Tuple[Optional[Dict], List[Dict], List[Dict], List[Dict]]]:
+        """
+        Fetch customer, assets, tickets and users for many customers concurrently
+        
+        Returns:
+            List of (customer, assets, tickets, users) tuples in input order
+        """
+        # Authenticate once up front so the parallel requests share a token
+        if not self.use_mock:
+            self._ensure_token()
+        
+        pending = [
+            [
+                self._executor.submit(self.get_customer, customer_id),
+                self._executor.submit(self.get_assets, customer_id),
+                self._executor.submit(self.get_tickets, customer_id),
+                self._executor.submit(self.get_users, customer_id)
+            ]
+            for customer_id in customer_ids
+        ]
+        return [tuple(f.result() for f in futures) for futures in pending]
+    
     # Mock data methods
     def _mock_customer(self, customer_id: str) -> Dict:
         """Generate mock customer data"""
@@ -182,6 +238,7 @@ class HaloConnector:
             priority = random.choice(priorities)
             category = random.choice(categories)
             status = random.choice(statuses)
+            closed = status in _CLOSED_STATUSES
             user = random.choice(user_names)
             asset_info = random.choice(asset_names)
             
@@ -193,8 +250,8 @@ class HaloConnector:
                 'id': f'ticket-{customer_id}-{i}',
                 'subject': f'{category} - {user}',
                 'created_at': created.isoformat(),
-                'resolved_at': resolved.isoformat() if status in ['Resolved', 'Closed'] else None,
-                'resolution_hours': resolution_hours if status in ['Resolved', 'Closed'] else None,
+                'resolved_at': resolved.isoformat() if closed else None,
+                'resolution_hours': resolution_hours if closed else None,
                 'sla_met': sla_met,
                 'category': category,
                 'priority': priority,
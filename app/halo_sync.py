@@ -6,12 +6,21 @@ import requests
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from app.models import db, Customer
+from app.http_client import SESSION
+
+# Keys every imported customer record must carry
+_REQUIRED_CUSTOMER_KEYS = ('customer_id', 'name', 'industry', 'metadata')
+
+# Halo custom field names that carry the customer's industry
+_INDUSTRY_FIELD_NAMES = frozenset(['industry', 'sector', 'vertical'])
 
 class HaloSyncService:
     """Service for syncing with HaloPSA"""
     
-    def __init__(self, api_url: str, client_id: str, client_secret: str, tenant_id: str = None):
+    def __init__(self, api_url: str, client_id: str, client_secret: str, tenant_id: str = None,
+                 session: requests.Session = None):
         self.api_url = api_url.rstrip('/')
+        self.session = session or SESSION
         self.client_id = client_id
         self.client_secret = client_secret
         self.tenant_id = tenant_id
@@ -28,7 +37,7 @@ class HaloSyncService:
             
             # Test API call
             headers = {'Authorization': f'Bearer {self.access_token}'}
-            response = requests.get(f"{self.api_url}/api/client", headers=headers, timeout=10)
+            response = self.session.get(f"{self.api_url}/api/client", headers=headers, timeout=10)
             
             if response.status_code == 200:
                 return True, "Connection successful!"
@@ -62,7 +71,7 @@ class HaloSyncService:
             if self.tenant_id:
                 data['tenant'] = self.tenant_id
             
-            response = requests.post(token_url, data=data, timeout=10)
+            response = self.session.post(token_url, data=data, timeout=10)
             
             if response.status_code == 200:
                 token_data = response.json()
@@ -87,7 +96,7 @@ class HaloSyncService:
             headers = {'Authorization': f'Bearer {self.access_token}'}
             
             # Fetch clients (customers)
-            response = requests.get(
+            response = self.session.get(
                 f"{self.api_url}/api/client",
                 headers=headers,
                 params={'pageinate': 'false', 'count': 1000},
@@ -125,7 +134,7 @@ class HaloSyncService:
         """Map Halo custom fields to industry"""
         # Look for industry field in custom fields
         for field in custom_fields:
-            if field.get('name', '').lower() in ['industry', 'sector', 'vertical']:
+            if field.get('name', '').lower() in _INDUSTRY_FIELD_NAMES:
                 value = field.get('value', '').lower()
                 if 'gov' in value or 'public' in value:
                     return 'government'
@@ -140,47 +149,90 @@ class HaloSyncService:
         
         return 'government'  # Default
     
-    def import_customers_to_db(self, customers: List[Dict]) -> Tuple[int, int, int]:
+    def import_customers_to_db(self, customers: List[Dict], chunk_size: int = 500) -> Tuple[int, int, int]:
         """
-        Import customers to database
+        Import customers to database in bulk, chunk_size rows at a time
+        Each chunk runs in its own SAVEPOINT; a chunk that still fails is retried
+        row by row so only the bad records count as errors
         Returns: (added, updated, errors)
         """
         added = 0
         updated = 0
         errors = 0
         
+        # Malformed records would fail the whole bulk statement; drop them up front
+        valid = []
         for customer_data in customers:
+            missing = [key for key in _REQUIRED_CUSTOMER_KEYS if key not in customer_data]
+            if missing:
+                print(f"Error importing customer {customer_data.get('customer_id')}: missing {', '.join(missing)}")
+                errors += 1
+            else:
+                valid.append(customer_data)
+        
+        for start in range(0, len(valid), chunk_size):
+            chunk = valid[start:start + chunk_size]
             try:
-                customer_id = customer_data['customer_id']
-                
-                # Check if customer exists
-                existing = Customer.query.filter_by(customer_id=customer_id).first()
-                
-                if existing:
-                    # Update existing
-                    existing.name = customer_data['name']
-                    existing.industry = customer_data['industry']
-                    existing.custom_metadata = customer_data['metadata']
-                    updated += 1
-                else:
-                    # Create new
-                    new_customer = Customer(
-                        customer_id=customer_id,
-                        name=customer_data['name'],
-                        industry=customer_data['industry'],
-                        custom_metadata=customer_data['metadata']
-                    )
-                    db.session.add(new_customer)
-                    added += 1
-                
-                db.session.commit()
+                with db.session.begin_nested():
+                    chunk_added, chunk_updated = self._import_chunk(chunk)
+                added += chunk_added
+                updated += chunk_updated
             
             except Exception as e:
-                print(f"Error importing customer {customer_data.get('customer_id')}: {e}")
-                db.session.rollback()
-                errors += 1
+                print(f"Error importing customers {start}-{start + len(chunk) - 1}, retrying one by one: {e}")
+                for customer_data in chunk:
+                    try:
+                        with db.session.begin_nested():
+                            row_added, row_updated = self._import_chunk([customer_data])
+                        added += row_added
+                        updated += row_updated
+                    except Exception as row_error:
+                        print(f"Error importing customer {customer_data.get('customer_id')}: {row_error}")
+                        errors += 1
         
+        db.session.commit()
         return added, updated, errors
+    
+    def _import_chunk(self, chunk: List[Dict]) -> Tuple[int, int]:
+        """Insert/update one chunk of customers with bulk mappings"""
+        added = 0
+        updated = 0
+        
+        # One query to find which customers already exist
+        ids = [customer_data['customer_id'] for customer_data in chunk]
+        existing = dict(
+            db.session.query(Customer.customer_id, Customer.id)
+            .filter(Customer.customer_id.in_(ids))
+            .all()
+        )
+        
+        new_rows = {}
+        update_rows = {}
+        for customer_data in chunk:
+            customer_id = customer_data['customer_id']
+            fields = {
+                'name': customer_data['name'],
+                'industry': customer_data['industry'],
+                'custom_metadata': customer_data['metadata']
+            }
+            
+            if customer_id in existing:
+                update_rows[customer_id] = {'id': existing[customer_id], **fields}
+                updated += 1
+            elif customer_id in new_rows:
+                # Repeated within the same import: the later record wins
+                new_rows[customer_id].update(fields)
+                updated += 1
+            else:
+                new_rows[customer_id] = {'customer_id': customer_id, **fields}
+                added += 1
+        
+        if new_rows:
+            db.session.bulk_insert_mappings(Customer, list(new_rows.values()))
+        if update_rows:
+            db.session.bulk_update_mappings(Customer, list(update_rows.values()))
+        
+        return added, updated
 
 from datetime import timedelta
 
@@ -0,0 +1,26 @@
+"""
+Shared HTTP session
+Keep-alive connection pool with retries, reused by the integration services and admin test endpoints
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.config import Config
+
+
+def create_session() -> requests.Session:
+    """Build a pooled session that retries transient gateway errors"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=Config.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=Config.HTTP_POOL_MAXSIZE,
+        max_retries=Retry(total=Config.HTTP_MAX_RETRIES, backoff_factor=0.3,
+                          status_forcelist=[502, 503, 504])
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+SESSION = create_session()
@@ -0,0 +1,38 @@
+"""
+orjson-backed JSON provider for Flask
+"""
+from decimal import Decimal
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+def _default(obj):
+    """Fallback for types orjson does not serialize natively"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, tuple) and hasattr(obj, '_asdict'):
+        return obj._asdict()
+    return DefaultJSONProvider.default(obj)
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Serialize responses with orjson instead of the stdlib json module"""
+    
+    # Naive datetimes are UTC throughout the app (datetime.utcnow defaults)
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=_default, option=self.option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=self.option),
+            mimetype=self.mimetype
+        )
@@ -106,6 +106,13 @@ class Meeting(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     created_by = db.Column(db.String(255))
     
+    # Dashboard lookups only ever filter on upcoming meetings
+    __table_args__ = (
+        db.Index('ix_meetings_active', customer_id, scheduled_date.desc(),
+                 postgresql_where=status.in_(['scheduled', 'rescheduled']),
+                 sqlite_where=status.in_(['scheduled', 'rescheduled'])),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -286,6 +293,13 @@ class ActionItem(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Open items are the hot set; completed history stays out of the index
+    __table_args__ = (
+        db.Index('ix_actions_open', customer_id, due_date,
+                 postgresql_where=status.in_(['open', 'in_progress']),
+                 sqlite_where=status.in_(['open', 'in_progress'])),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -6,11 +6,14 @@ from flask import Blueprint, request, jsonify
 from datetime import datetime, date
 import json
 
+from app.config import Config
+
 lifecycle_bp = Blueprint('lifecycle', __name__, url_prefix='/api/lifecycle')
 
 def init_lifecycle_routes(app, db):
     """Initialize lifecycle routes with app and db"""
     from app.lifecycle_models import ClientGoal, Meeting, ClientAgreement, ClientSegmentation, ActionItem
+    from app.models import Customer, ReportRun
     from app.segmentation_service import SegmentationService
     from app.clientiq_service import ClientIQService
     from app.calendar_service import CalendarService
@@ -258,6 +261,52 @@ def init_lifecycle_routes(app, db):
         segments = query.all()
         return jsonify([s.to_dict() for s in segments])
     
+    @lifecycle_bp.route('/segmentation/recalculate', methods=['POST'])
+    def recalculate_all_segmentation():
+        """Recalculate segmentation for every customer with agreements or a segment"""
+        # Only the columns segmentation reads; reports newest first per customer,
+        # since the health score takes security posture from the first one
+        agreements = [
+            dict(row._mapping) for row in db.session.execute(db.select(
+                ClientAgreement.customer_id, ClientAgreement.status,
+                ClientAgreement.monthly_mrr, ClientAgreement.start_date
+            ))
+        ]
+        meetings = [
+            {'customer_id': customer_id, 'scheduled_date': scheduled_date.isoformat()}
+            for customer_id, scheduled_date in db.session.execute(
+                db.select(Meeting.customer_id, Meeting.scheduled_date)
+            )
+        ]
+        reports = [
+            {'customer_id': customer_id, 'generated_at': generated_at.isoformat(), 'overall_score': overall_score}
+            for customer_id, generated_at, overall_score in db.session.execute(
+                db.select(ReportRun.customer_id, ReportRun.generated_at, ReportRun.overall_score)
+                .order_by(ReportRun.generated_at.desc())
+            )
+        ]
+        segments = {s.customer_id: s for s in ClientSegmentation.query.all()}
+        
+        customer_ids = list(dict.fromkeys([*segments, *(a['customer_id'] for a in agreements)]))
+        results = segmentation_service.calculate_segmentation_for_rows(
+            customer_ids, agreements, meetings, reports
+        )
+        
+        for segment_data in results:
+            segment = segments.get(segment_data['customer_id'])
+            if segment:
+                if Config.SEGMENT_MRR_TRIGGER:
+                    # The trigger owns total_mrr for existing segments
+                    del segment_data['total_mrr']
+                for key, value in segment_data.items():
+                    if hasattr(segment, key):
+                        setattr(segment, key, value)
+            else:
+                db.session.add(ClientSegmentation(**segment_data))
+        
+        db.session.commit()
+        return jsonify({'recalculated': len(results)})
+    
     @lifecycle_bp.route('/segmentation/<customer_id>', methods=['GET'])
     def get_segmentation(customer_id):
         """Get segmentation for specific customer"""
@@ -335,8 +384,6 @@ def init_lifecycle_routes(app, db):
     @lifecycle_bp.route('/clientiq/<customer_id>/summary', methods=['GET'])
     def get_client_summary(customer_id):
         """Get AI-powered client summary"""
-        from app.models import Customer, ReportRun
-        
         customer = Customer.query.filter_by(customer_id=customer_id).first_or_404()
         reports = ReportRun.query.filter_by(customer_id=customer_id).order_by(ReportRun.generated_at.desc()).limit(5).all()
         meetings = Meeting.query.filter_by(customer_id=customer_id).order_by(Meeting.scheduled_date.desc()).limit(10).all()
@@ -356,8 +403,6 @@ def init_lifecycle_routes(app, db):
     @lifecycle_bp.route('/clientiq/<customer_id>/meeting-prep', methods=['GET'])
     def get_meeting_prep(customer_id):
         """Get AI-powered meeting preparation"""
-        from app.models import Customer
-        
         customer = Customer.query.filter_by(customer_id=customer_id).first_or_404()
         meeting_type = request.args.get('type', 'qbr')
         
@@ -376,23 +421,34 @@ def init_lifecycle_routes(app, db):
     
     def _recalculate_segmentation(customer_id):
         """Recalculate segmentation for a customer"""
-        from app.models import ReportRun
-        
         agreements = ClientAgreement.query.filter_by(customer_id=customer_id).all()
         meetings = Meeting.query.filter_by(customer_id=customer_id).all()
-        reports = ReportRun.query.filter_by(customer_id=customer_id).all()
+        # Newest first: the health score reads security posture from reports[0]
+        reports = (
+            ReportRun.query.filter_by(customer_id=customer_id)
+            .order_by(ReportRun.generated_at.desc())
+            .all()
+        )
+        segment = ClientSegmentation.query.filter_by(customer_id=customer_id).first()
+        
+        # total_mrr is kept current by the t_agree_mrr trigger when installed;
+        # a new segment still needs the full sum to seed it
+        total_mrr = segment.total_mrr if segment and Config.SEGMENT_MRR_TRIGGER else None
         
         segment_data = segmentation_service.calculate_segmentation(
             customer_id,
             [a.to_dict() for a in agreements],
             [m.to_dict() for m in meetings],
-            [r.to_dict() for r in reports]
+            [r.to_dict() for r in reports],
+            total_mrr=total_mrr
         )
         
         # Update or create segmentation record
-        segment = ClientSegmentation.query.filter_by(customer_id=customer_id).first()
-        
         if segment:
+            if total_mrr is not None:
+                # The trigger owns total_mrr; writing back the value read above
+                # would overwrite any agreement delta committed since
+                del segment_data['total_mrr']
             for key, value in segment_data.items():
                 if hasattr(segment, key):
                     setattr(segment, key, value)
@@ -1,20 +1,33 @@
-from flask import Flask, request, jsonify, render_template, send_file, redirect, url_for, flash, session
+from flask import Flask, request, jsonify, render_template, send_file, redirect, url_for, flash, session, make_response
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import hashlib
 import os
+import time
+
+import diskcache
+import orjson
+from sqlalchemy import event, func, text
+from sqlalchemy.orm import Session, defer, object_session
 
 from app.models import db, ReportRun, Customer
+from app.lifecycle_models import ClientSegmentation
+from app.cache import cache
 from app.config import Config
+from app.json_provider import ORJSONProvider
 from app.halo_connector import HaloConnector
 from app.signal_processor import SignalProcessor
 from app.scoring_engine import ScoringEngine
 from app.budget_engine import BudgetEngine
 from app.report_builder import ReportBuilder
 from app.ai_insights import AIInsightsEngine
-from app.roi_engine import ROIEngine
+from app.roi_engine import ROIEngine, to_dict
 from app.stakeholder_content import StakeholderContentGenerator
 from app.admin_auth import AdminAuth, require_admin
 from app.integration_config import IntegrationConfig
 from app.halo_sync import HaloSyncService
+from app.http_client import SESSION
 from app.azure_ai_service import AzureAIService
 from app.lifecycle_routes import init_lifecycle_routes
 
@@ -23,9 +36,11 @@ app = Flask(__name__,
             static_folder='../static')
 app.config.from_object(Config)
 app.secret_key = Config.SECRET_KEY
+app.json = ORJSONProvider(app)
 
 # Initialize database
 db.init_app(app)
+cache.init_app(app)
 
 # Initialize admin components
 admin_auth = AdminAuth()
@@ -42,47 +57,326 @@ halo = HaloConnector(
 
 signal_processor = SignalProcessor()
 
-scoring_engine = ScoringEngine({
-    'THRESHOLD_PATCH_COMPLIANCE': Config.THRESHOLD_PATCH_COMPLIANCE,
-    'THRESHOLD_BACKUP_SUCCESS': Config.THRESHOLD_BACKUP_SUCCESS,
-    'THRESHOLD_EDR_COVERAGE': Config.THRESHOLD_EDR_COVERAGE,
-    'THRESHOLD_SLA_ATTAINMENT': Config.THRESHOLD_SLA_ATTAINMENT
-})
+# Heavy engines are built lazily on first use so workers fork quickly
+@lru_cache(maxsize=1)
+def get_scoring_engine():
+    return ScoringEngine({
+        'THRESHOLD_PATCH_COMPLIANCE': Config.THRESHOLD_PATCH_COMPLIANCE,
+        'THRESHOLD_BACKUP_SUCCESS': Config.THRESHOLD_BACKUP_SUCCESS,
+        'THRESHOLD_EDR_COVERAGE': Config.THRESHOLD_EDR_COVERAGE,
+        'THRESHOLD_SLA_ATTAINMENT': Config.THRESHOLD_SLA_ATTAINMENT
+    })
 
-budget_engine = BudgetEngine({
-    'COST_MFA_PER_USER': Config.COST_MFA_PER_USER,
-    'COST_EDR_PER_ENDPOINT': Config.COST_EDR_PER_ENDPOINT,
-    'COST_BACKUP_PER_SERVER': Config.COST_BACKUP_PER_SERVER,
-    'COST_SIEM_PER_USER': Config.COST_SIEM_PER_USER
-})
+@lru_cache(maxsize=1)
+def get_budget_engine():
+    return BudgetEngine({
+        'COST_MFA_PER_USER': Config.COST_MFA_PER_USER,
+        'COST_EDR_PER_ENDPOINT': Config.COST_EDR_PER_ENDPOINT,
+        'COST_BACKUP_PER_SERVER': Config.COST_BACKUP_PER_SERVER,
+        'COST_SIEM_PER_USER': Config.COST_SIEM_PER_USER
+    })
 
-report_builder = ReportBuilder(
-    templates_dir=os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates'),
-    reports_dir=Config.REPORTS_DIR
-)
+def _pdf_queue():
+    """RQ queue for PDF rendering when ASYNC_PDF is enabled"""
+    if not Config.ASYNC_PDF:
+        return None
+    from app.tasks import get_queue
+    return get_queue()
+
+@lru_cache(maxsize=1)
+def get_report_builder():
+    return ReportBuilder(
+        templates_dir=os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates'),
+        reports_dir=Config.REPORTS_DIR,
+        bytecode_cache_dir=Config.JINJA_CACHE_DIR,
+        parallel=Config.PARALLEL_REPORT_RENDER,
+        pdf_queue=_pdf_queue()
+    )
+
+@lru_cache(maxsize=1)
+def get_ai_insights_engine():
+    return AIInsightsEngine()
+
+# Overlaps the AI insights step with the ROI calculations
+_analysis_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='analysis')
 
-ai_insights_engine = AIInsightsEngine()
+@lru_cache(maxsize=1)
+def get_analysis_cache():
+    return diskcache.Cache(Config.CACHE_DIR)
 
-# Create tables
-with app.app_context():
-    db.create_all()
+def init_db():
+    """Create any missing tables"""
+    with app.app_context():
+        db.create_all()
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create database tables (flask --app app.main init-db)"""
+    init_db()
+    print('Database tables created')
+
+# Schema setup runs once from the container entrypoint, not in every worker
+if os.environ.get('SBR_INIT_DB') == '1' and not app.config.get('TESTING'):
+    init_db()
+
+# Rendered dashboard bodies and ETags, keyed by the is_admin flag
+_index_cache = {}
 
 @app.route('/')
 def index():
     """Main dashboard"""
     # Check if user is logged in as admin
-    is_admin = session.get('admin_logged_in', False)
-    return render_template('index.html', is_admin=is_admin)
+    is_admin = bool(session.get('admin_logged_in', False))
+    
+    cached = _index_cache.get(is_admin)
+    if cached is None:
+        body = render_template('index.html', is_admin=is_admin)
+        cached = _index_cache[is_admin] = (body, hashlib.blake2b(body.encode(), digest_size=16).hexdigest())
+    body, etag = cached
+    
+    response = make_response(body)
+    response.set_etag(etag)
+    # The page differs for admin sessions without a Vary: Cookie, so the browser
+    # must revalidate every time; the ETag still turns repeats into a 304
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
+
+# (generated_at, serialized body); the body is rebuilt at most once per second
+_health_cache = [0.0, None]
 
 @app.route('/health')
 def health():
     """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.utcnow().isoformat(),
-        'version': '1.0.0',
-        'mock_data': Config.USE_MOCK_DATA
-    })
+    now = time.time()
+    if now - _health_cache[0] >= 1:
+        _health_cache[:] = [now, orjson.dumps({
+            'status': 'healthy',
+            'timestamp': datetime.utcfromtimestamp(now).isoformat(),
+            'version': '1.0.0',
+            'mock_data': Config.USE_MOCK_DATA
+        })]
+    return app.response_class(_health_cache[1], mimetype='application/json')
+
+# Bump whenever signal, scoring, budget, insight or ROI logic changes so cached
+# analyses from the previous release are not served after a deploy
+ANALYSIS_VERSION = 1
+
+def _analysis_cache_key(customer, assets, tickets, users):
+    """Hash the fetched Halo payloads plus the code version and config values that affect scoring"""
+    settings = [
+        ANALYSIS_VERSION,
+        Config.THRESHOLD_PATCH_COMPLIANCE, Config.THRESHOLD_BACKUP_SUCCESS,
+        Config.THRESHOLD_EDR_COVERAGE, Config.THRESHOLD_SLA_ATTAINMENT,
+        Config.COST_MFA_PER_USER, Config.COST_EDR_PER_ENDPOINT,
+        Config.COST_BACKUP_PER_SERVER, Config.COST_SIEM_PER_USER
+    ]
+    payload = orjson.dumps([customer, assets, tickets, users, settings],
+                           option=orjson.OPT_SORT_KEYS, default=str)
+    return 'analysis:' + hashlib.blake2b(payload, digest_size=32).hexdigest()
+
+def _analyze_customer(customer, assets, tickets, users):
+    """Return the analysis bundle, reusing a cached one when the inputs are unchanged"""
+    cache = get_analysis_cache()
+    key = _analysis_cache_key(customer, assets, tickets, users)
+    
+    analysis = cache.get(key)
+    if analysis is None:
+        analysis = _compute_analysis(customer, assets, tickets, users)
+        cache.set(key, analysis, expire=Config.ANALYSIS_CACHE_TTL)
+    return analysis
+
+def _compute_analysis(customer, assets, tickets, users):
+    """Run the scoring, budget, insight and ROI pipeline for one customer"""
+    # Step 2: Derive signals
+    signals = signal_processor.derive_signals(customer, assets, tickets, users)
+    
+    # Step 3: Calculate NIST scores
+    scoring_engine = get_scoring_engine()
+    nist_scores = scoring_engine.calculate_nist_scores(signals)
+    
+    # Step 4: Identify gaps
+    gaps = scoring_engine.identify_gaps(signals, nist_scores)
+    
+    # Step 5: Generate recommendations
+    recommendations = scoring_engine.generate_recommendations(gaps, signals)
+    
+    # Step 6: Calculate budget
+    budget = get_budget_engine().calculate_budget(signals, gaps)
+    
+    # Step 7: Generate AI insights (in the background; may call out to an LLM)
+    customer_data = {
+        'customer': customer,
+        'assets': assets,
+        'tickets': tickets,
+        'users': users
+    }
+    ai_insights_future = _analysis_executor.submit(
+        get_ai_insights_engine().generate_insights, signals, customer_data
+    )
+    
+    # Step 7b: Calculate ROI and generate stakeholder content
+    customer_name = customer.get('name', 'Unknown')
+    industry = customer.get('industry', 'government')
+    roi_engine = ROIEngine(industry=industry)
+    stakeholder_gen = StakeholderContentGenerator()
+    
+    # Calculate all 4 ROI formats
+    critical_incidents = sum(1 for t in tickets if t.get('priority') == 'Critical')
+    total_monthly = budget.get('total_monthly', 0)
+    annual_investment = total_monthly * 12
+    overall = nist_scores.get('Overall', 0)
+    overall_pct = overall * 100
+    gap_count = len(gaps)
+    
+    roi_risk_avoidance = roi_engine.calculate_risk_avoidance_roi(
+        investment=annual_investment,
+        incidents_prevented=max(critical_incidents, 3),
+        avg_incident_duration_hours=6.0
+    )
+    
+    total_risk_prevented = roi_risk_avoidance.total_risk_prevented
+    
+    roi_compliance = roi_engine.calculate_compliance_roi(
+        current_compliance_pct=overall_pct,
+        target_compliance_pct=100,
+        penalty_at_current=250000,
+        cost_to_reach_target=annual_investment
+    )
+    
+    roi_three_year = roi_engine.calculate_three_year_stacked_roi(
+        year1_investment=annual_investment,
+        year1_savings=total_risk_prevented * 0.3
+    )
+    
+    # Generate industry-specific metrics and peer benchmarking
+    industry_metrics = roi_engine.generate_industry_metrics(signals, tickets)
+    peer_benchmark = roi_engine.generate_peer_benchmark(signals)
+    
+    # Calculate tiered budget
+    tiered_budget = roi_engine.calculate_tiered_budget(
+        total_budget=annual_investment,
+        gaps=gaps,
+        current_monthly_cost=total_monthly
+    )
+    
+    # The efficiency ROI is the only figure that depends on the AI insights
+    ai_insights = ai_insights_future.result()
+    roi_efficiency = roi_engine.calculate_efficiency_unlock_roi(
+        hours_freed_annually=ai_insights.get('ticket_analysis', {}).get('total_tickets', 100) * 0.25,
+        cost_per_hour=50.0
+    )
+    
+    # Combine all ROI data
+    roi_data = {
+        'risk_avoidance': to_dict(roi_risk_avoidance),
+        'efficiency': to_dict(roi_efficiency),
+        'compliance': to_dict(roi_compliance),
+        'three_year': to_dict(roi_three_year),
+        'industry_metrics': industry_metrics,
+        'peer_benchmark': peer_benchmark,
+        'tiered_budget': tiered_budget
+    }
+    
+    # Generate stakeholder content
+    executive_onepager = stakeholder_gen.generate_executive_onepager(
+        customer_name=customer_name,
+        overall_score=overall_pct,
+        roi_data=roi_data['risk_avoidance'],
+        top_risks=gaps[:3],
+        top_recommendations=recommendations[:3]
+    )
+    
+    board_talking_points = stakeholder_gen.generate_board_talking_points(
+        customer_name=customer_name,
+        industry=industry,
+        key_metrics=industry_metrics,
+        peer_benchmark=peer_benchmark,
+        incidents_prevented=critical_incidents
+    )
+    
+    budget_justification = stakeholder_gen.generate_budget_justification(
+        tiered_budget=tiered_budget,
+        current_state={
+            'compliance_pct': overall_pct,
+            'gap_count': gap_count,
+            'posture_description': 'Needs Improvement' if overall < 0.75 else 'Good',
+            'risk_exposure': total_risk_prevented
+        },
+        target_state={
+            'compliance_pct': 100,
+            'gaps_closed': gap_count,
+            'posture_description': 'Strong',
+            'risk_reduction': total_risk_prevented
+        }
+    )
+    
+    stakeholder_data = {
+        'executive_onepager': executive_onepager,
+        'board_talking_points': board_talking_points,
+        'budget_justification': budget_justification,
+        'industry': industry_metrics.get('industry', 'Unknown')
+    }
+    
+    return {
+        'signals': signals,
+        'nist_scores': nist_scores,
+        'gaps': gaps,
+        'recommendations': recommendations,
+        'budget': budget,
+        'ai_insights': ai_insights,
+        'roi_data': roi_data,
+        'stakeholder_data': stakeholder_data
+    }
+
+def _build_report_row(customer_id, customer, analysis):
+    """Render report files and build the column values for a ReportRun"""
+    nist_scores = analysis['nist_scores']
+    budget = analysis['budget']
+    customer_name = customer.get('name', 'Unknown')
+    
+    # Step 8: Generate reports
+    report_paths = get_report_builder().generate_report(
+        customer_id=customer_id,
+        customer_name=customer_name,
+        **analysis
+    )
+    
+    # Step 9: Build database record
+    row = dict(
+        customer_id=customer_id,
+        customer_name=customer_name,
+        industry=customer.get('industry', 'government'),
+        signals=analysis['signals'],
+        nist_scores=nist_scores,
+        overall_score=nist_scores.get('Overall', 0),
+        gaps=analysis['gaps'],
+        recommendations=analysis['recommendations'],
+        budget=budget,
+        total_monthly_cost=budget.get('total_monthly', 0),
+        markdown_path=report_paths.get('markdown'),
+        html_path=report_paths.get('html'),
+        pdf_path=report_paths.get('pdf')
+    )
+    
+    return row, report_paths
+
+def _review_response(report_id, customer, analysis, report_paths):
+    """Build the API payload describing a generated review"""
+    return {
+        'success': True,
+        'report_id': report_id,
+        'customer_name': customer.get('name'),
+        'overall_score': analysis['nist_scores'].get('Overall'),
+        'total_monthly_cost': analysis['budget'].get('total_monthly'),
+        'gaps_count': len(analysis['gaps']),
+        'reports': {
+            'markdown': os.path.basename(report_paths.get('markdown')),
+            'html': os.path.basename(report_paths.get('html')),
+            'pdf': os.path.basename(report_paths.get('pdf')) if report_paths.get('pdf') else None
+        },
+        # Set when the PDF is still rendering on a worker (poll /api/jobs/<id>)
+        'pdf_job_id': report_paths.get('pdf_job_id')
+    }
 
 @app.route('/api/generate-review', methods=['POST'])
 def generate_review():
@@ -94,202 +388,194 @@ def generate_review():
         if not customer_id:
             return jsonify({'error': 'customer_id is required'}), 400
         
-        # Step 1: Fetch data from Halo
-        customer = halo.get_customer(customer_id)
+        # Step 1: Fetch data from Halo (requests run concurrently)
+        customer, assets, tickets, users = halo.get_customer_bundle(customer_id)
         if not customer:
             return jsonify({'error': 'Customer not found'}), 404
         
-        assets = halo.get_assets(customer_id)
-        tickets = halo.get_tickets(customer_id)
-        users = halo.get_users(customer_id)
-        
-        # Step 2: Derive signals
-        signals = signal_processor.derive_signals(customer, assets, tickets, users)
-        
-        # Step 3: Calculate NIST scores
-        nist_scores = scoring_engine.calculate_nist_scores(signals)
-        
-        # Step 4: Identify gaps
-        gaps = scoring_engine.identify_gaps(signals, nist_scores)
-        
-        # Step 5: Generate recommendations
-        recommendations = scoring_engine.generate_recommendations(gaps, signals)
-        
-        # Step 6: Calculate budget
-        budget = budget_engine.calculate_budget(signals, gaps)
-        
-        # Step 7: Generate AI insights
-        customer_data = {
-            'customer': customer,
-            'assets': assets,
-            'tickets': tickets,
-            'users': users
-        }
-        ai_insights = ai_insights_engine.generate_insights(signals, customer_data)
-        
-        # Step 7b: Calculate ROI and generate stakeholder content
-        industry = customer.get('industry', 'government')
-        roi_engine = ROIEngine(industry=industry)
-        stakeholder_gen = StakeholderContentGenerator()
-        
-        # Calculate all 4 ROI formats
-        critical_incidents = len([t for t in tickets if t.get('priority') == 'Critical'])
-        annual_investment = budget.get('total_monthly', 0) * 12
-        
-        roi_risk_avoidance = roi_engine.calculate_risk_avoidance_roi(
-            investment=annual_investment,
-            incidents_prevented=max(critical_incidents, 3),
-            avg_incident_duration_hours=6.0
-        )
-        
-        roi_efficiency = roi_engine.calculate_efficiency_unlock_roi(
-            hours_freed_annually=ai_insights.get('ticket_analysis', {}).get('total_tickets', 100) * 0.25,
-            cost_per_hour=50.0
-        )
-        
-        roi_compliance = roi_engine.calculate_compliance_roi(
-            current_compliance_pct=nist_scores.get('Overall', 0) * 100,
-            target_compliance_pct=100,
-            penalty_at_current=250000,
-            cost_to_reach_target=annual_investment
-        )
+        # Hand the heavy steps to an RQ worker when background jobs are enabled
+        if Config.ASYNC_REPORTS:
+            from app.tasks import get_queue, run_review_tail
+            job = get_queue().enqueue(run_review_tail, customer_id, customer, assets, tickets, users,
+                                      job_timeout=Config.REPORT_JOB_TIMEOUT)
+            return jsonify({
+                'success': True,
+                'job_id': job.id,
+                'status': job.get_status(),
+                'status_url': url_for('job_status', job_id=job.id)
+            }), 202
         
-        roi_three_year = roi_engine.calculate_three_year_stacked_roi(
-            year1_investment=annual_investment,
-            year1_savings=roi_risk_avoidance.get('total_risk_prevented', 0) * 0.3
-        )
+        analysis = _analyze_customer(customer, assets, tickets, users)
+        row, report_paths = _build_report_row(customer_id, customer, analysis)
+        report_run = ReportRun(**row)
         
-        # Generate industry-specific metrics and peer benchmarking
-        industry_metrics = roi_engine.generate_industry_metrics(signals, tickets)
-        peer_benchmark = roi_engine.generate_peer_benchmark(signals)
+        db.session.add(report_run)
+        db.session.commit()
+        _invalidate_customer_views()
         
-        # Calculate tiered budget
-        tiered_budget = roi_engine.calculate_tiered_budget(
-            total_budget=annual_investment,
-            gaps=gaps,
-            current_monthly_cost=budget.get('total_monthly', 0)
-        )
+        return jsonify(_review_response(report_run.id, customer, analysis, report_paths))
         
-        # Combine all ROI data
-        roi_data = {
-            'risk_avoidance': roi_risk_avoidance,
-            'efficiency': roi_efficiency,
-            'compliance': roi_compliance,
-            'three_year': roi_three_year,
-            'industry_metrics': industry_metrics,
-            'peer_benchmark': peer_benchmark,
-            'tiered_budget': tiered_budget
-        }
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/generate-review/batch', methods=['POST'])
+def generate_review_batch():
+    """Generate Strategic Business Reviews for several customers in one request"""
+    try:
+        data = request.get_json() or {}
+        customer_ids = data.get('customer_ids')
         
-        # Generate stakeholder content
-        executive_onepager = stakeholder_gen.generate_executive_onepager(
-            customer_name=customer.get('name', 'Unknown'),
-            overall_score=nist_scores.get('Overall', 0) * 100,
-            roi_data=roi_risk_avoidance,
-            top_risks=gaps[:3],
-            top_recommendations=recommendations[:3]
-        )
+        if not customer_ids or not isinstance(customer_ids, list):
+            return jsonify({'error': 'customer_ids must be a non-empty list'}), 400
         
-        board_talking_points = stakeholder_gen.generate_board_talking_points(
-            customer_name=customer.get('name', 'Unknown'),
-            industry=industry,
-            key_metrics=industry_metrics,
-            peer_benchmark=peer_benchmark,
-            incidents_prevented=critical_incidents
-        )
+        # Fetch Halo data for every customer concurrently
+        bundles = halo.get_customer_bundles(customer_ids)
         
-        budget_justification = stakeholder_gen.generate_budget_justification(
-            tiered_budget=tiered_budget,
-            current_state={
-                'compliance_pct': nist_scores.get('Overall', 0) * 100,
-                'gap_count': len(gaps),
-                'posture_description': 'Needs Improvement' if nist_scores.get('Overall', 0) < 0.75 else 'Good',
-                'risk_exposure': roi_risk_avoidance.get('total_risk_prevented', 0)
-            },
-            target_state={
-                'compliance_pct': 100,
-                'gaps_closed': len(gaps),
-                'posture_description': 'Strong',
-                'risk_reduction': roi_risk_avoidance.get('total_risk_prevented', 0)
-            }
-        )
+        results = []
+        generated = []
+        for index, (customer_id, bundle) in enumerate(zip(customer_ids, bundles)):
+            customer, assets, tickets, users = bundle
+            if not customer:
+                results.append({'index': index, 'customer_id': customer_id, 'success': False,
+                                'error': 'Customer not found'})
+                continue
+            
+            try:
+                analysis = _analyze_customer(customer, assets, tickets, users)
+                row, report_paths = _build_report_row(customer_id, customer, analysis)
+            except Exception as e:
+                results.append({'index': index, 'customer_id': customer_id, 'success': False,
+                                'error': str(e)})
+                continue
+            
+            generated.append((index, customer_id, customer, analysis, row, report_paths))
         
-        stakeholder_data = {
-            'executive_onepager': executive_onepager,
-            'board_talking_points': board_talking_points,
-            'budget_justification': budget_justification,
-            'industry': industry_metrics.get('industry', 'Unknown')
-        }
+        # One executemany INSERT and a single commit for the whole batch
+        report_ids = []
+        if generated:
+            report_ids = db.session.scalars(
+                db.insert(ReportRun).returning(ReportRun.id, sort_by_parameter_order=True),
+                [item[4] for item in generated]
+            ).all()
+            db.session.commit()
+            _invalidate_customer_views()
         
-        # Step 8: Generate reports
-        report_paths = report_builder.generate_report(
-            customer_id=customer_id,
-            customer_name=customer.get('name', 'Unknown'),
-            signals=signals,
-            nist_scores=nist_scores,
-            gaps=gaps,
-            recommendations=recommendations,
-            budget=budget,
-            ai_insights=ai_insights,
-            roi_data=roi_data,
-            stakeholder_data=stakeholder_data
-        )
+        for (index, customer_id, customer, analysis, row, report_paths), report_id in zip(generated, report_ids):
+            result = _review_response(report_id, customer, analysis, report_paths)
+            result.update({'index': index, 'customer_id': customer_id})
+            results.append(result)
         
-        # Step 9: Save to database
-        report_run = ReportRun(
-            customer_id=customer_id,
-            customer_name=customer.get('name', 'Unknown'),
-            industry=customer.get('industry', 'government'),
-            signals=signals,
-            nist_scores=nist_scores,
-            overall_score=nist_scores.get('Overall', 0),
-            gaps=gaps,
-            recommendations=recommendations,
-            budget=budget,
-            total_monthly_cost=budget.get('total_monthly', 0),
-            markdown_path=report_paths.get('markdown'),
-            html_path=report_paths.get('html'),
-            pdf_path=report_paths.get('pdf')
-        )
-        
-        db.session.add(report_run)
-        db.session.commit()
-        
-        return jsonify({
-            'success': True,
-            'report_id': report_run.id,
-            'customer_name': customer.get('name'),
-            'overall_score': nist_scores.get('Overall'),
-            'total_monthly_cost': budget.get('total_monthly'),
-            'gaps_count': len(gaps),
-            'reports': {
-                'markdown': os.path.basename(report_paths.get('markdown')),
-                'html': os.path.basename(report_paths.get('html')),
-                'pdf': os.path.basename(report_paths.get('pdf')) if report_paths.get('pdf') else None
-            }
-        })
+        results.sort(key=lambda r: r['index'])
+        return jsonify({'success': True, 'results': results})
         
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    """Get the status (and result, once finished) of a background job"""
+    from rq.exceptions import NoSuchJobError
+    from rq.job import Job
+    from app.tasks import get_redis
+    
+    try:
+        job = Job.fetch(job_id, connection=get_redis())
+    except NoSuchJobError:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    status = job.get_status()
+    response = {'job_id': job.id, 'status': status}
+    if status == 'finished':
+        response['result'] = job.result
+    elif status == 'failed':
+        lines = (job.exc_info or '').strip().splitlines()
+        response['error'] = lines[-1] if lines else 'Job failed'
+    return jsonify(response)
+
 @app.route('/api/reports')
 def list_reports():
-    """List all generated reports"""
-    reports = ReportRun.query.order_by(ReportRun.generated_at.desc()).all()
+    """List generated reports (dashboard fields only, newest first)"""
+    # Negative values error on Postgres and mean "no limit" on SQLite
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 200)
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    
+    # Dashboard statistics cover every report, not just this page
+    stats = db.session.execute(
+        db.select(
+            func.count(ReportRun.id).label('total'),
+            func.count(func.distinct(ReportRun.customer_id)).label('total_customers'),
+            func.avg(ReportRun.overall_score).label('avg_score')
+        )
+    ).one()
+    
+    rows = db.session.execute(
+        db.select(
+            ReportRun.id, ReportRun.customer_id, ReportRun.customer_name,
+            ReportRun.industry, ReportRun.generated_at, ReportRun.overall_score,
+            ReportRun.total_monthly_cost, ReportRun.pdf_path
+        )
+        .order_by(ReportRun.generated_at.desc())
+        .limit(limit)
+        .offset(offset)
+    ).all()
+    
+    reports = []
+    for r in rows:
+        report = dict(r._mapping)
+        report['generated_at'] = r.generated_at.isoformat()
+        reports.append(report)
+    
     return jsonify({
-        'reports': [r.to_dict() for r in reports]
+        'reports': reports,
+        'limit': limit,
+        'offset': offset,
+        'total': stats.total,
+        'total_customers': stats.total_customers,
+        'avg_score': float(stats.avg_score) if stats.avg_score is not None else None
     })
 
 @app.route('/api/reports/<int:report_id>')
 def get_report(report_id):
     """Get a specific report"""
-    report = ReportRun.query.get_or_404(report_id)
+    report = db.get_or_404(ReportRun, report_id)
     return jsonify(report.to_dict())
 
+def _send_report(filepath, mimetype, as_attachment=False, max_age=None):
+    """Send a report file, letting nginx serve the bytes when X-Accel-Redirect is configured"""
+    filename = os.path.basename(filepath)
+    
+    if Config.REPORTS_ACCEL_PREFIX:
+        # nginx discards upstream Content-Encoding on X-Accel-Redirect, so always
+        # point it at the plain file and let brotli_static pick the .br copy
+        response = make_response('')
+        response.headers['X-Accel-Redirect'] = Config.REPORTS_ACCEL_PREFIX.rstrip('/') + '/' + filename
+        response.headers['Content-Type'] = mimetype
+        if as_attachment:
+            response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+        if max_age is not None:
+            response.cache_control.max_age = max_age
+        return response
+    
+    # Prefer the Brotli copy written alongside the report when the client accepts it
+    encoding = None
+    if 'br' in request.accept_encodings and os.path.exists(filepath + '.br'):
+        filepath += '.br'
+        encoding = 'br'
+    
+    # send_file emits X-Sendfile itself when USE_X_SENDFILE is set
+    response = send_file(filepath, mimetype=mimetype, as_attachment=as_attachment,
+                         download_name=filename, conditional=True, max_age=max_age)
+    
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
 @app.route('/api/reports/<int:report_id>/download/<format>')
 def download_report(report_id, format):
     """Download a report in specified format"""
-    report = ReportRun.query.get_or_404(report_id)
+    report = db.get_or_404(ReportRun, report_id)
     
     if format == 'markdown':
         filepath = report.markdown_path
@@ -306,20 +592,17 @@ def download_report(report_id, format):
     if not filepath or not os.path.exists(filepath):
         return jsonify({'error': 'Report file not found'}), 404
     
-    return send_file(filepath, mimetype=mimetype, as_attachment=True)
+    return _send_report(filepath, mimetype, as_attachment=True)
 
 @app.route('/view/<int:report_id>')
 def view_report(report_id):
     """View a report in the browser"""
-    report = ReportRun.query.get_or_404(report_id)
+    report = db.get_or_404(ReportRun, report_id)
     
     if not report.html_path or not os.path.exists(report.html_path):
         return "Report not found", 404
     
-    with open(report.html_path, 'r') as f:
-        html_content = f.read()
-    
-    return html_content
+    return _send_report(report.html_path, 'text/html', max_age=300)
 
 # ============================================================================
 # ADMIN ROUTES
@@ -348,24 +631,103 @@ def admin_logout():
     flash('Logged out successfully', 'info')
     return redirect(url_for('admin_login'))
 
+def _admin_config():
+    """
+    Integration settings and sync history shown on the admin panel
+    
+    Not memoized: the dicts carry client secrets and API keys, which must not
+    be pickled into the shared (Redis) cache, and IntegrationConfig already
+    holds them in memory.
+    """
+    return (
+        integration_config.get_halo_config(),
+        integration_config.get_okta_config(),
+        integration_config.get_azure_ai_config(),
+        integration_config.get_sync_history()
+    )
+
+# Customer grid, per-customer report counts and the report total in one round-trip.
+# Starting from the totals row keeps the KPI when there are no customers yet.
+_ADMIN_DASHBOARD_SQL = text("""
+    WITH rc AS (
+        SELECT customer_id, COUNT(*) AS report_count
+        FROM report_runs
+        GROUP BY customer_id
+    ), tc AS (
+        SELECT COUNT(*) AS total_reports FROM report_runs
+    )
+    SELECT c.customer_id, c.name, c.industry, c.created_at,
+           COALESCE(rc.report_count, 0) AS report_count,
+           tc.total_reports
+    FROM tc
+    LEFT JOIN customers c ON 1 = 1
+    LEFT JOIN rc ON rc.customer_id = c.customer_id
+    ORDER BY c.id
+""").columns(
+    db.column('customer_id', db.String), db.column('name', db.String),
+    db.column('industry', db.String), db.column('created_at', db.DateTime),
+    db.column('report_count', db.Integer), db.column('total_reports', db.Integer)
+)
+
+@cache.memoize(timeout=15)
+def _admin_dashboard():
+    """Customer table rows (with report counts), customer total and report total for the admin panel"""
+    result = db.session.execute(_ADMIN_DASHBOARD_SQL).all()
+    
+    report_count = result[0].total_reports if result else 0
+    rows = [
+        {
+            'customer_id': row.customer_id,
+            'name': row.name,
+            'industry': row.industry,
+            'report_count': row.report_count,
+            'created_at': row.created_at
+        }
+        for row in result
+        if row.customer_id is not None
+    ]
+    return rows, len(rows), report_count
+
+def _on_report_inserted(mapper, connection, target):
+    # Flush runs before commit; invalidating now would let another worker
+    # re-cache the old counts, so only mark the session here
+    object_session(target).info['reports_inserted'] = True
+
+def _on_session_commit(session):
+    if session.info.pop('reports_inserted', False):
+        _invalidate_customer_views()
+
+def _on_session_rollback(session):
+    session.info.pop('reports_inserted', None)
+
+# ORM inserts invalidate the cached counts once committed (this is the only
+# invalidation on the RQ worker path); Core bulk inserts must invalidate themselves
+event.listen(ReportRun, 'after_insert', _on_report_inserted)
+event.listen(Session, 'after_commit', _on_session_commit)
+event.listen(Session, 'after_rollback', _on_session_rollback)
+
+def _invalidate_customer_views():
+    """Drop cached customer listings after customers or reports change"""
+    cache.delete('view//api/customers')
+    cache.delete_memoized(_admin_dashboard)
+
+def _report_counts():
+    """Map customer_id -> number of ReportRuns, in a single GROUP BY query"""
+    return dict(
+        db.session.query(ReportRun.customer_id, func.count(ReportRun.id))
+        .group_by(ReportRun.customer_id)
+        .all()
+    )
+
 @app.route('/admin')
 @require_admin
 def admin_panel():
     """Admin panel main page"""
     # Get configuration
-    halo_config = integration_config.get_halo_config()
-    okta_config = integration_config.get_okta_config()
-    azure_config = integration_config.get_azure_ai_config()
-    sync_history = integration_config.get_sync_history()
+    halo_config, okta_config, azure_config, sync_history = _admin_config()
     
     # Get customer statistics
-    customers = Customer.query.all()
-    customer_count = len(customers)
-    report_count = ReportRun.query.count()
-    
-    # Add report count to each customer
-    for customer in customers:
-        customer.report_count = ReportRun.query.filter_by(customer_id=customer.customer_id).count()
+    customers, customer_count, report_count = _admin_dashboard()
     
     return render_template('admin.html',
                          halo_config=halo_config,
@@ -467,6 +829,10 @@ def import_halo_customers():
     except Exception as e:
         integration_config.add_sync_history('halo', 'error', str(e), 0)
         return jsonify({'success': False, 'message': str(e)})
+    
+    finally:
+        # The customer list changed
+        _invalidate_customer_views()
 
 @app.route('/admin/okta/save', methods=['POST'])
 @require_admin
@@ -499,11 +865,15 @@ def test_okta_connection():
     
     try:
         # Test by fetching OIDC discovery document
-        import requests
         issuer = config.get('issuer') or f"https://{config['domain']}/oauth2/default"
         discovery_url = f"{issuer}/.well-known/openid-configuration"
         
-        response = requests.get(discovery_url, timeout=10)
+        # Only reachability matters, so skip downloading the document body
+        response = SESSION.head(discovery_url, timeout=(3, 5), allow_redirects=True)
+        if response.status_code in (405, 501):
+            # IdP doesn't support HEAD; read just the status line of a GET
+            with SESSION.get(discovery_url, timeout=(3, 10), stream=True) as response:
+                pass
         
         if response.status_code == 200:
             return jsonify({'success': True, 'message': 'Connection successful! OIDC discovery endpoint accessible.'})
@@ -513,18 +883,30 @@ def test_okta_connection():
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)})
 
+def _form_value(name, cast, default):
+    """Read a typed form field, using default when it is missing or blank (raises ValueError if malformed)"""
+    value = request.form.get(name)
+    return cast(value) if value not in (None, '') else default
+
 @app.route('/admin/azure/save', methods=['POST'])
 @require_admin
 def save_azure_config():
     """Save Azure AI configuration"""
+    try:
+        temperature = _form_value('temperature', float, 0.7)
+        max_tokens = _form_value('max_tokens', int, 2000)
+    except ValueError:
+        flash('Temperature must be a number and max tokens a whole number', 'error')
+        return redirect(url_for('admin_panel'))
+    
     config = {
         'enabled': request.form.get('enabled') == 'on',
         'endpoint': request.form.get('endpoint', ''),
         'api_key': request.form.get('api_key', ''),
         'deployment_name': request.form.get('deployment_name', ''),
         'api_version': request.form.get('api_version', '2024-02-15-preview'),
-        'temperature': float(request.form.get('temperature', 0.7)),
-        'max_tokens': int(request.form.get('max_tokens', 2000))
+        'temperature': temperature,
+        'max_tokens': max_tokens
     }
     
     if integration_config.set_azure_ai_config(config):
@@ -558,16 +940,37 @@ def test_azure_connection():
         return jsonify({'success': False, 'message': str(e)})
 
 # Customer Management API Endpoints
+
+# Fields clients may set through the customer API
+_CUSTOMER_UPDATABLE = frozenset({
+    'name', 'industry', 'employees', 'contact', 'email', 'phone', 'total_assets', 'servers',
+    'patch_compliance', 'backup_success', 'edr_coverage', 'sla_attainment'
+})
+_CUSTOMER_CREATABLE = _CUSTOMER_UPDATABLE | {'customer_id'}
+
+# Columns returned by the customer listing
+_CUSTOMER_LIST_COLUMNS = (
+    Customer.id, Customer.customer_id, Customer.name, Customer.industry,
+    Customer.contact, Customer.email, Customer.phone,
+    Customer.employees, Customer.total_assets, Customer.servers,
+    Customer.patch_compliance, Customer.backup_success, Customer.edr_coverage, Customer.sla_attainment,
+    Customer.last_synced, Customer.created_at
+)
+
 @app.route('/api/customers', methods=['GET'])
+@cache.cached(timeout=30, response_filter=lambda rv: not isinstance(rv, tuple))
 def get_customers():
     """Get all customers"""
     try:
-        customers = Customer.query.all()
+        # Everything but the custom_metadata JSON blob
+        customers = db.session.execute(db.select(*_CUSTOMER_LIST_COLUMNS)).all()
+        counts = _report_counts()
         customer_list = []
         for customer in customers:
-            report_count = ReportRun.query.filter_by(customer_id=customer.customer_id).count()
-            customer_dict = customer.to_dict()
-            customer_dict['report_count'] = report_count
+            customer_dict = customer._asdict()
+            customer_dict['last_synced'] = customer.last_synced.isoformat() if customer.last_synced else None
+            customer_dict['created_at'] = customer.created_at.isoformat() if customer.created_at else None
+            customer_dict['report_count'] = counts.get(customer.customer_id, 0)
             customer_list.append(customer_dict)
         
         return jsonify({'success': True, 'customers': customer_list})
@@ -578,7 +981,7 @@ def get_customers():
 def get_customer(customer_id):
     """Get a specific customer"""
     try:
-        customer = Customer.query.get(customer_id)
+        customer = db.session.get(Customer, customer_id)
         if not customer:
             return jsonify({'success': False, 'message': 'Customer not found'}), 404
         
@@ -597,24 +1000,11 @@ def create_customer():
         if existing:
             return jsonify({'success': False, 'message': 'Customer ID already exists'}), 400
         
-        customer = Customer(
-            customer_id=data.get('customer_id'),
-            name=data.get('name'),
-            industry=data.get('industry'),
-            employees=data.get('employees'),
-            contact=data.get('contact'),
-            email=data.get('email'),
-            phone=data.get('phone'),
-            total_assets=data.get('total_assets'),
-            servers=data.get('servers'),
-            patch_compliance=data.get('patch_compliance'),
-            backup_success=data.get('backup_success'),
-            edr_coverage=data.get('edr_coverage'),
-            sla_attainment=data.get('sla_attainment')
-        )
+        customer = Customer(**{field: data.get(field) for field in _CUSTOMER_CREATABLE})
         
         db.session.add(customer)
         db.session.commit()
+        _invalidate_customer_views()
         
         return jsonify({'success': True, 'customer': customer.to_dict()})
     except Exception as e:
@@ -625,39 +1015,18 @@ def create_customer():
 def update_customer(customer_id):
     """Update an existing customer"""
     try:
-        customer = Customer.query.get(customer_id)
+        customer = db.session.get(Customer, customer_id)
         if not customer:
             return jsonify({'success': False, 'message': 'Customer not found'}), 404
         
         data = request.get_json()
         
         # Update fields
-        if 'name' in data:
-            customer.name = data['name']
-        if 'industry' in data:
-            customer.industry = data['industry']
-        if 'employees' in data:
-            customer.employees = data['employees']
-        if 'contact' in data:
-            customer.contact = data['contact']
-        if 'email' in data:
-            customer.email = data['email']
-        if 'phone' in data:
-            customer.phone = data['phone']
-        if 'total_assets' in data:
-            customer.total_assets = data['total_assets']
-        if 'servers' in data:
-            customer.servers = data['servers']
-        if 'patch_compliance' in data:
-            customer.patch_compliance = data['patch_compliance']
-        if 'backup_success' in data:
-            customer.backup_success = data['backup_success']
-        if 'edr_coverage' in data:
-            customer.edr_coverage = data['edr_coverage']
-        if 'sla_attainment' in data:
-            customer.sla_attainment = data['sla_attainment']
+        for field in _CUSTOMER_UPDATABLE.intersection(data):
+            setattr(customer, field, data[field])
         
         db.session.commit()
+        _invalidate_customer_views()
         
         return jsonify({'success': True, 'customer': customer.to_dict()})
     except Exception as e:
@@ -668,12 +1037,13 @@ def update_customer(customer_id):
 def delete_customer(customer_id):
     """Delete a customer"""
     try:
-        customer = Customer.query.get(customer_id)
+        customer = db.session.get(Customer, customer_id)
         if not customer:
             return jsonify({'success': False, 'message': 'Customer not found'}), 404
         
         db.session.delete(customer)
         db.session.commit()
+        _invalidate_customer_views()
         
         return jsonify({'success': True, 'message': 'Customer deleted successfully'})
     except Exception as e:
@@ -709,13 +1079,17 @@ app.register_blueprint(lifecycle_bp)
 @app.route('/client/<customer_id>')
 def client_overview(customer_id):
     """Client overview page"""
-    from app.lifecycle_models import ClientSegmentation
-    
-    customer = Customer.query.filter_by(customer_id=customer_id).first_or_404()
-    segment = ClientSegmentation.query.filter_by(customer_id=customer_id).first()
+    # One round-trip for the customer and its segmentation; the metadata JSON isn't shown
+    customer, segment = (
+        db.session.query(Customer, ClientSegmentation)
+        .outerjoin(ClientSegmentation, ClientSegmentation.customer_id == Customer.customer_id)
+        .options(defer(Customer.custom_metadata))
+        .filter(Customer.customer_id == customer_id)
+        .first_or_404()
+    )
     
     return render_template('client_overview.html', 
-                         customer=customer.to_dict(),
+                         customer=customer.to_dict(include_metadata=False),
                          segment=segment.to_dict() if segment else {})
 
 # Add meetings hub route
@@ -725,5 +1099,6 @@ def meetings_hub():
     return render_template('meetings_hub.html')
 
 if __name__ == '__main__':
-    app.run(host='0.0.0', port=5000, debug=True)
+    init_db()
+    app.run(host='0.0.0.0', port=5000, debug=Config.FLASK_ENV == 'development')
 
@@ -1,9 +1,22 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from datetime import datetime
 import json
+import sqlite3
+from operator import attrgetter
 
 db = SQLAlchemy()
 
+@event.listens_for(Engine, 'connect')
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL with relaxed fsync when running on SQLite (local/dev)"""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.close()
+
 class ReportRun(db.Model):
     """Stores generated report metadata and results"""
     __tablename__ = 'report_runs'
@@ -34,6 +47,13 @@ class ReportRun(db.Model):
     html_path = db.Column(db.String(500))
     pdf_path = db.Column(db.String(500))
     
+    __table_args__ = (
+        # Report listing pages newest-first
+        db.Index('ix_report_runs_generated_at', generated_at.desc()),
+        # Covers the per-customer report count GROUP BY (index-only scan)
+        db.Index('ix_report_runs_customer_id_id', customer_id, id),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -83,24 +103,19 @@ class Customer(db.Model):
     last_synced = db.Column(db.DateTime, default=datetime.utcnow)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'customer_id': self.customer_id,
-            'name': self.name,
-            'industry': self.industry,
-            'contact': self.contact,
-            'email': self.email,
-            'phone': self.phone,
-            'employees': self.employees,
-            'total_assets': self.total_assets,
-            'servers': self.servers,
-            'patch_compliance': self.patch_compliance,
-            'backup_success': self.backup_success,
-            'edr_coverage': self.edr_coverage,
-            'sla_attainment': self.sla_attainment,
-            'metadata': self.custom_metadata,
-            'last_synced': self.last_synced.isoformat() if self.last_synced else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+    def to_dict(self, include_metadata=True):
+        # include_metadata=False avoids loading a deferred custom_metadata column
+        data = dict(zip(_CUSTOMER_DICT_FIELDS, _customer_dict_values(self)))
+        data['metadata'] = self.custom_metadata if include_metadata else None
+        last_synced, created_at = self.last_synced, self.created_at
+        data['last_synced'] = last_synced.isoformat() if last_synced else None
+        data['created_at'] = created_at.isoformat() if created_at else None
+        return data
 
+# Plain columns copied as-is by Customer.to_dict, in output order
+_CUSTOMER_DICT_FIELDS = (
+    'id', 'customer_id', 'name', 'industry', 'contact', 'email', 'phone',
+    'employees', 'total_assets', 'servers',
+    'patch_compliance', 'backup_success', 'edr_coverage', 'sla_attainment'
+)
+_customer_dict_values = attrgetter(*_CUSTOMER_DICT_FIELDS)
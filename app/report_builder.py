@@ -1,16 +1,33 @@
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import markdown
 import os
-from weasyprint import HTML
+import brotli
 
 class ReportBuilder:
     """Generates reports in multiple formats"""
     
-    def __init__(self, templates_dir: str, reports_dir: str):
+    def __init__(self, templates_dir: str, reports_dir: str, bytecode_cache_dir: str = None,
+                 parallel: bool = False, pdf_queue=None):
         self.templates_dir = templates_dir
         self.reports_dir = reports_dir
-        self.env = Environment(loader=FileSystemLoader(templates_dir))
+        
+        # RQ queue for rendering PDFs on a worker; None renders inline
+        self.pdf_queue = pdf_queue
+        
+        # Optional pool for rendering Markdown and HTML side by side
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='report') if parallel else None
+        
+        # Compiled templates are kept on disk across restarts and never re-stat'ed
+        bytecode_cache = None
+        if bytecode_cache_dir:
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+        self.env = Environment(loader=FileSystemLoader(templates_dir), auto_reload=False,
+                               bytecode_cache=bytecode_cache)
+        self._md_template = self.env.get_template('report_template.md')
+        self._html_template = self.env.get_template('report_template.html')
         
         # Ensure reports directory exists
         os.makedirs(reports_dir, exist_ok=True)
@@ -46,47 +63,75 @@ class ReportBuilder:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         base_filename = f"sbr_{customer_id}_{timestamp}"
         
-        # Generate Markdown
-        md_path = self._generate_markdown(base_filename, context)
-        
-        # Generate HTML
-        html_path = self._generate_html(base_filename, context)
+        if self._executor:
+            # Markdown and HTML are independent; the PDF waits on the HTML
+            md_future = self._executor.submit(self._generate_markdown, base_filename, context)
+            html_future = self._executor.submit(self._generate_html, base_filename, context)
+            md_path, html_path = md_future.result(), html_future.result()
+        else:
+            # Generate Markdown
+            md_path = self._generate_markdown(base_filename, context)
+            
+            # Generate HTML
+            html_path = self._generate_html(base_filename, context)
         
         # Generate PDF
-        pdf_path = self._generate_pdf(base_filename, html_path)
+        if self.pdf_queue is not None:
+            pdf_path, pdf_job_id = self._enqueue_pdf(base_filename, html_path)
+        else:
+            pdf_path, pdf_job_id = self._generate_pdf(base_filename, html_path), None
         
         return {
             'markdown': md_path,
             'html': html_path,
-            'pdf': pdf_path
+            'pdf': pdf_path,
+            'pdf_job_id': pdf_job_id
         }
     
     def _generate_markdown(self, filename: str, context: dict) -> str:
         """Generate Markdown report"""
-        template = self.env.get_template('report_template.md')
-        content = template.render(**context)
-        
         filepath = os.path.join(self.reports_dir, f"{filename}.md")
-        with open(filepath, 'w') as f:
-            f.write(content)
+        # Stream chunks straight to disk instead of building the whole string
+        self._md_template.stream(**context).dump(filepath, encoding='utf-8')
+        
+        self._write_brotli(filepath)
         
         return filepath
     
     def _generate_html(self, filename: str, context: dict) -> str:
         """Generate HTML report"""
-        template = self.env.get_template('report_template.html')
-        content = template.render(**context)
-        
         filepath = os.path.join(self.reports_dir, f"{filename}.html")
-        with open(filepath, 'w') as f:
-            f.write(content)
+        # Stream chunks straight to disk instead of building the whole string
+        self._html_template.stream(**context).dump(filepath, encoding='utf-8')
+        
+        self._write_brotli(filepath)
         
         return filepath
     
+    def _write_brotli(self, filepath: str):
+        """Write a pre-compressed .br copy so it can be served without compressing per request"""
+        with open(filepath, 'rb') as f:
+            data = f.read()
+        with open(filepath + '.br', 'wb') as f:
+            f.write(brotli.compress(data, quality=5))
+    
+    def _enqueue_pdf(self, filename: str, html_path: str) -> tuple:
+        """
+        Queue PDF rendering on a background worker
+        
+        Returns:
+            (path the PDF will be written to, job id)
+        """
+        pdf_path = os.path.join(self.reports_dir, f"{filename}.pdf")
+        job = self.pdf_queue.enqueue('app.tasks.render_report_pdf', html_path, pdf_path)
+        return pdf_path, job.id
+    
     def _generate_pdf(self, filename: str, html_path: str) -> str:
         """Generate PDF report from HTML"""
         try:
             pdf_path = os.path.join(self.reports_dir, f"{filename}.pdf")
+            # Imported lazily: WeasyPrint pulls in Pango/Cairo bindings
+            from weasyprint import HTML
             HTML(filename=html_path).write_pdf(pdf_path)
             return pdf_path
         except Exception as e:
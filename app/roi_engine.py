@@ -1,4 +1,236 @@
-from typing import Dict, List, Any
+import sys
+from bisect import bisect_right
+from dataclasses import dataclass
+from enum import IntEnum
+from functools import lru_cache
+from typing import Dict, List, Any, Final, NamedTuple, Tuple, Union
+
+import numpy as np
+
+from app.scoring_engine import GAP_ISSUES
+
+# Ticket categories that self-service / automation removes
+SELF_SERVICE_CATEGORIES = frozenset(['Password Reset', 'Account Access'])
+CRITICAL_PRIORITY = 'Critical'
+
+HOURS_PER_YEAR = 24 * 365
+
+# Gap severity -> budget tier index; anything else lands in Tier 3
+SEVERITY_TIER = {'Critical': 0, 'High': 1}
+
+# Per-tier share of current monthly spend and the outcome attached to each item
+TIER_COST_FACTORS = (0.3, 0.2, 0.1)
+TIER_ITEM_OUTCOMES = (
+    'Regulatory compliance maintained, 0 breaches',
+    'Staff freed for core mission, downtime cut 75%',
+    'Competitive advantage, better customer experience'
+)
+
+
+# Peer percentile by patch compliance: <75, 75-84, 85-94, 95+
+SCORE_BREAKS = (75, 85, 95)
+PERCENTILE_LUT = (25, 50, 75, 90)
+_SCORE_BREAKS_ARR = np.array(SCORE_BREAKS, dtype=np.float64)
+_PERCENTILE_LUT_ARR = np.array(PERCENTILE_LUT, dtype=np.int16)
+
+# Presentation lines, parsed once instead of on every call
+_PRES_RISK = "Your {inv} investment prevents {tot} in lost revenue. ROI: {mult:.1f}x"
+_PRES_EFFICIENCY = "{hours:,.0f} hours freed annually = ${savings:,.0f} value (at ${rate}/hr fully loaded cost)"
+_PRES_COMPLIANCE = "{current:.0f}% compliant with {framework} standards. {gap:.0f}% gap = ${penalty:,.0f} potential penalties. {cost_k}K to close."
+_PRES_THREE_YEAR = "3-year value: Year 1 ${y1:,.0f} + Year 2 ${y2:,.0f} + Year 3 ${y3:,.0f} = ${total:,.0f} total"
+
+# Budget recommendation by number of cumulative tier totals the budget covers
+_BUDGET_FMTS = (
+    lambda budget, tier1, tier1_2, all_tiers:
+        f"At ${budget:,.0f} budget, you're ${tier1 - budget:,.0f} short of minimum compliance requirements (Tier 1).",
+    lambda budget, tier1, tier1_2, all_tiers:
+        f"At ${budget:,.0f} budget, prioritize Tier 1 fully, plus {(budget - tier1) / (tier1_2 - tier1) * 100:.0f}% of Tier 2. Tier 3 deferred.",
+    lambda budget, tier1, tier1_2, all_tiers:
+        f"At ${budget:,.0f} budget, prioritize Tier 1+2 fully, plus {(budget - tier1_2) / (all_tiers - tier1_2) * 100:.0f}% of Tier 3.",
+    lambda budget, tier1, tier1_2, all_tiers:
+        f"At ${budget:,.0f} budget, you can implement all three tiers for comprehensive protection."
+)
+
+
+@lru_cache(maxsize=4096)
+def _fmt_money(int_dollars: int) -> str:
+    """Format whole dollars as $1,234; keyed on ints so similar scenarios share entries"""
+    return f"${int_dollars:,.0f}"
+
+
+class RiskAvoidanceResult(NamedTuple):
+    """Format 1: Risk Avoidance Model"""
+    format: str
+    investment: float
+    downtime_cost_per_hour: float
+    incidents_prevented: int
+    avg_incident_duration_hours: float
+    total_risk_prevented: float
+    net_roi: float
+    roi_multiplier: float
+    presentation: str
+
+
+class EfficiencyResult(NamedTuple):
+    """Format 2: Efficiency Unlock"""
+    format: str
+    hours_freed_annually: float
+    hours_per_week: float
+    cost_per_hour: float
+    annual_savings: float
+    redeployment_value: float
+    presentation: str
+
+
+class ComplianceResult(NamedTuple):
+    """Format 3: Compliance/Risk Score"""
+    format: str
+    current_compliance: float
+    target_compliance: float
+    compliance_gap: float
+    penalty_at_current: float
+    cost_to_reach_target: float
+    risk_reduction: float
+    net_value: float
+    presentation: str
+
+
+class YearResult(NamedTuple):
+    investment: float
+    savings: float
+    net: float
+
+
+class ThreeYearResult(NamedTuple):
+    """Format 4: Three-Year Stacked ROI"""
+    format: str
+    year1: YearResult
+    year2: YearResult
+    year3: YearResult
+    cumulative_value: float
+    presentation: str
+
+
+def to_dict(result: NamedTuple) -> Dict[str, Any]:
+    """Convert an ROI result (including nested year results) to a plain dict"""
+    return {
+        key: to_dict(value) if hasattr(value, '_asdict') else value
+        for key, value in result._asdict().items()
+    }
+
+
+class Industry(IntEnum):
+    """Supported industries; values index INDUSTRY_PARAMS"""
+    GOVERNMENT = 0
+    NONPROFIT = 1
+    MANUFACTURING = 2
+    FINANCIAL = 3
+    HEALTHCARE = 4
+
+
+@dataclass(frozen=True, slots=True)
+class IndustryParams:
+    """Industry-specific ROI parameters"""
+    name: str
+    downtime_cost_per_hour: int
+    compliance_frameworks: Tuple[str, ...]
+    key_metrics: Tuple[str, ...]
+    breach_cost_multiplier: float
+
+
+# Industry-specific parameters, indexed by Industry
+INDUSTRY_PARAMS: Final[Tuple[IndustryParams, ...]] = (
+    IndustryParams(
+        name='Local Government & Schools',
+        downtime_cost_per_hour=12000,  # Average for municipalities
+        compliance_frameworks=('FERPA', 'HIPAA', 'CJIS'),
+        key_metrics=('uptime', 'compliance_score', 'cost_per_user'),
+        breach_cost_multiplier=2.5
+    ),
+    IndustryParams(
+        name='Nonprofits (Health & Public Service)',
+        downtime_cost_per_hour=5000,
+        compliance_frameworks=('HIPAA', 'PCI-DSS'),
+        key_metrics=('staff_hours_saved', 'ticket_backlog', 'cost_per_ticket'),
+        breach_cost_multiplier=3.4  # Mission impact multiplier
+    ),
+    IndustryParams(
+        name='Manufacturing',
+        downtime_cost_per_hour=84000,  # Production line cost
+        compliance_frameworks=('ISO 27001', 'NIST'),
+        key_metrics=('production_uptime', 'mttr', 'revenue_protection'),
+        breach_cost_multiplier=12.0  # High revenue impact
+    ),
+    IndustryParams(
+        name='Financial Services',
+        downtime_cost_per_hour=50000,
+        compliance_frameworks=('OCC', 'GLBA', 'SOX', 'PCI-DSS'),
+        key_metrics=('compliance_score', 'transaction_uptime', 'regulatory_confidence'),
+        breach_cost_multiplier=15.0  # Regulatory penalties
+    ),
+    IndustryParams(
+        name='Healthcare Organizations',
+        downtime_cost_per_hour=120000,  # Patient safety value
+        compliance_frameworks=('HIPAA', 'HITECH'),
+        key_metrics=('ehr_uptime', 'patient_safety_incidents', 'breach_detection_time'),
+        breach_cost_multiplier=8.0  # Patient care impact
+    )
+)
+
+# Industry strings accepted by ROIEngine (industry_type on Customer),
+# interned so literal lowercase names from callers match by identity first
+_STR_TO_ENUM = {sys.intern(member.name.lower()): member for member in Industry}
+
+
+# Industry-specific metric builders, called as fn(engine, signals, tickets)
+
+def _gov_metrics(engine: 'ROIEngine', signals: Dict[str, Any], tickets: List[Dict]) -> Dict[str, Any]:
+    return {
+        'uptime_pct': 100 - (signals.get('incident_volume', 0) * 0.01),
+        'cost_per_user_per_month': signals.get('total_users', 1) * 25,  # Estimate
+        'audit_readiness_score': signals.get('patch_compliance', 0)
+    }
+
+
+def _np_metrics(engine: 'ROIEngine', signals: Dict[str, Any], tickets: List[Dict]) -> Dict[str, Any]:
+    return {
+        'manual_hours_freed': sum(1 for t in tickets if t.get('category') in SELF_SERVICE_CATEGORIES) * 0.5,
+        'ticket_backlog_days': 14,  # From AI insights
+        'tech_spend_pct_of_budget': 3.5  # Typical for nonprofits
+    }
+
+
+def _mfg_metrics(engine: 'ROIEngine', signals: Dict[str, Any], tickets: List[Dict]) -> Dict[str, Any]:
+    return {
+        'production_uptime_pct': 100 - (signals.get('incident_volume', 0) * 0.005),
+        'mttr_minutes': 45,  # Mean time to recovery
+        'revenue_at_risk': engine._annual_revenue_at_risk
+    }
+
+
+def _fin_metrics(engine: 'ROIEngine', signals: Dict[str, Any], tickets: List[Dict]) -> Dict[str, Any]:
+    return {
+        'regulatory_findings_closed': 23,  # From requirements
+        'compliance_score': signals.get('patch_compliance', 0),
+        'transaction_uptime': 99.97
+    }
+
+
+def _hc_metrics(engine: 'ROIEngine', signals: Dict[str, Any], tickets: List[Dict]) -> Dict[str, Any]:
+    return {
+        'ehr_uptime_pct': 99.97,
+        'patient_safety_incidents_prevented': max(0, 10 - sum(1 for t in tickets if t.get('priority') == CRITICAL_PRIORITY)),
+        'breach_detection_time_minutes': 14
+    }
+
+
+def _no_metrics(engine: 'ROIEngine', signals: Dict[str, Any], tickets: List[Dict]) -> Dict[str, Any]:
+    return {}
+
+
+# Indexed by Industry
+_METRICS_DISPATCH = (_gov_metrics, _np_metrics, _mfg_metrics, _fin_metrics, _hc_metrics)
+
 
 class ROIEngine:
     """
@@ -6,79 +238,62 @@ class ROIEngine:
     Based on CIT SBR Framework requirements
     """
     
-    # Industry-specific parameters
-    INDUSTRY_PARAMS = {
-        'government': {
-            'name': 'Local Government & Schools',
-            'downtime_cost_per_hour': 12000,  # Average for municipalities
-            'compliance_frameworks': ['FERPA', 'HIPAA', 'CJIS'],
-            'key_metrics': ['uptime', 'compliance_score', 'cost_per_user'],
-            'breach_cost_multiplier': 2.5
-        },
-        'nonprofit': {
-            'name': 'Nonprofits (Health & Public Service)',
-            'downtime_cost_per_hour': 5000,
-            'compliance_frameworks': ['HIPAA', 'PCI-DSS'],
-            'key_metrics': ['staff_hours_saved', 'ticket_backlog', 'cost_per_ticket'],
-            'breach_cost_multiplier': 3.4  # Mission impact multiplier
-        },
-        'manufacturing': {
-            'name': 'Manufacturing',
-            'downtime_cost_per_hour': 84000,  # Production line cost
-            'compliance_frameworks': ['ISO 27001', 'NIST'],
-            'key_metrics': ['production_uptime', 'mttr', 'revenue_protection'],
-            'breach_cost_multiplier': 12.0  # High revenue impact
-        },
-        'financial': {
-            'name': 'Financial Services',
-            'downtime_cost_per_hour': 50000,
-            'compliance_frameworks': ['OCC', 'GLBA', 'SOX', 'PCI-DSS'],
-            'key_metrics': ['compliance_score', 'transaction_uptime', 'regulatory_confidence'],
-            'breach_cost_multiplier': 15.0  # Regulatory penalties
-        },
-        'healthcare': {
-            'name': 'Healthcare Organizations',
-            'downtime_cost_per_hour': 120000,  # Patient safety value
-            'compliance_frameworks': ['HIPAA', 'HITECH'],
-            'key_metrics': ['ehr_uptime', 'patient_safety_incidents', 'breach_detection_time'],
-            'breach_cost_multiplier': 8.0  # Patient care impact
-        }
-    }
-    
     def __init__(self, industry: str = 'government'):
         """Initialize with industry type"""
-        self.industry = industry.lower()
-        self.params = self.INDUSTRY_PARAMS.get(self.industry, self.INDUSTRY_PARAMS['government'])
+        # Callers almost always pass a known lowercase name; skip .lower() then
+        self.industry = industry if industry in _STR_TO_ENUM else industry.lower()
+        self._industry_enum = _STR_TO_ENUM.get(self.industry, Industry.GOVERNMENT)
+        self.params = INDUSTRY_PARAMS[self._industry_enum]
+        # params are immutable, so the yearly downtime exposure is fixed per engine
+        self._annual_revenue_at_risk = self.params.downtime_cost_per_hour * HOURS_PER_YEAR
+        # Unknown industries borrow government params but get no extra metrics
+        self._metrics_fn = (_METRICS_DISPATCH[self._industry_enum]
+                            if self.industry in _STR_TO_ENUM else _no_metrics)
     
     def calculate_risk_avoidance_roi(self, 
                                       investment: float,
                                       incidents_prevented: int,
-                                      avg_incident_duration_hours: float = 6.0) -> Dict[str, Any]:
+                                      avg_incident_duration_hours: float = 6.0) -> RiskAvoidanceResult:
         """
         Format 1: Risk Avoidance Model
         Used for: Finance, Manufacturing, Healthcare leadership
         """
-        downtime_cost_per_hour = self.params['downtime_cost_per_hour']
-        total_risk_prevented = downtime_cost_per_hour * incidents_prevented * avg_incident_duration_hours
+        return self._risk_core(
+            investment, incidents_prevented, avg_incident_duration_hours,
+            self.params.downtime_cost_per_hour
+        )
+    
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _risk_core(investment: float,
+                   incidents_prevented: int,
+                   avg_hours: float,
+                   dc_per_hour: float) -> RiskAvoidanceResult:
+        """Body of calculate_risk_avoidance_roi, memoized on its inputs"""
+        total_risk_prevented = dc_per_hour * incidents_prevented * avg_hours
         net_roi = total_risk_prevented - investment
         roi_multiplier = total_risk_prevented / investment if investment > 0 else 0
         
-        return {
-            'format': 'Risk Avoidance',
-            'investment': investment,
-            'downtime_cost_per_hour': downtime_cost_per_hour,
-            'incidents_prevented': incidents_prevented,
-            'avg_incident_duration_hours': avg_incident_duration_hours,
-            'total_risk_prevented': total_risk_prevented,
-            'net_roi': net_roi,
-            'roi_multiplier': roi_multiplier,
-            'presentation': f"Your ${investment:,.0f} investment prevents ${total_risk_prevented:,.0f} in lost revenue. ROI: {roi_multiplier:.1f}x"
-        }
+        return RiskAvoidanceResult(
+            format='Risk Avoidance',
+            investment=investment,
+            downtime_cost_per_hour=dc_per_hour,
+            incidents_prevented=incidents_prevented,
+            avg_incident_duration_hours=avg_hours,
+            total_risk_prevented=total_risk_prevented,
+            net_roi=net_roi,
+            roi_multiplier=roi_multiplier,
+            presentation=_PRES_RISK.format(
+                inv=_fmt_money(round(investment)),
+                tot=_fmt_money(round(total_risk_prevented)),
+                mult=roi_multiplier
+            )
+        )
     
     def calculate_efficiency_unlock_roi(self,
                                          hours_freed_annually: float,
                                          cost_per_hour: float = 50.0,
-                                         redeployment_value_multiplier: float = 1.5) -> Dict[str, Any]:
+                                         redeployment_value_multiplier: float = 1.5) -> EfficiencyResult:
         """
         Format 2: Efficiency Unlock
         Used for: Operations, Nonprofits
@@ -87,21 +302,23 @@ class ROIEngine:
         redeployment_value = annual_savings * redeployment_value_multiplier
         hours_per_week = hours_freed_annually / 52
         
-        return {
-            'format': 'Efficiency Unlock',
-            'hours_freed_annually': hours_freed_annually,
-            'hours_per_week': hours_per_week,
-            'cost_per_hour': cost_per_hour,
-            'annual_savings': annual_savings,
-            'redeployment_value': redeployment_value,
-            'presentation': f"{hours_freed_annually:,.0f} hours freed annually = ${annual_savings:,.0f} value (at ${cost_per_hour}/hr fully loaded cost)"
-        }
+        return EfficiencyResult(
+            format='Efficiency Unlock',
+            hours_freed_annually=hours_freed_annually,
+            hours_per_week=hours_per_week,
+            cost_per_hour=cost_per_hour,
+            annual_savings=annual_savings,
+            redeployment_value=redeployment_value,
+            presentation=_PRES_EFFICIENCY.format(
+                hours=hours_freed_annually, savings=annual_savings, rate=cost_per_hour
+            )
+        )
     
     def calculate_compliance_roi(self,
                                    current_compliance_pct: float,
                                    target_compliance_pct: float,
                                    penalty_at_current: float,
-                                   cost_to_reach_target: float) -> Dict[str, Any]:
+                                   cost_to_reach_target: float) -> ComplianceResult:
         """
         Format 3: Compliance/Risk Score
         Used for: Government, Financial, Healthcare
@@ -110,26 +327,40 @@ class ROIEngine:
         risk_reduction = penalty_at_current * (compliance_gap / 100)
         net_value = risk_reduction - cost_to_reach_target
         
-        return {
-            'format': 'Compliance/Risk Score',
-            'current_compliance': current_compliance_pct,
-            'target_compliance': target_compliance_pct,
-            'compliance_gap': compliance_gap,
-            'penalty_at_current': penalty_at_current,
-            'cost_to_reach_target': cost_to_reach_target,
-            'risk_reduction': risk_reduction,
-            'net_value': net_value,
-            'presentation': f"{current_compliance_pct:.0f}% compliant with {self.params['compliance_frameworks'][0]} standards. {compliance_gap:.0f}% gap = ${penalty_at_current:,.0f} potential penalties. {int(cost_to_reach_target/1000)}K to close."
-        }
+        return ComplianceResult(
+            format='Compliance/Risk Score',
+            current_compliance=current_compliance_pct,
+            target_compliance=target_compliance_pct,
+            compliance_gap=compliance_gap,
+            penalty_at_current=penalty_at_current,
+            cost_to_reach_target=cost_to_reach_target,
+            risk_reduction=risk_reduction,
+            net_value=net_value,
+            presentation=_PRES_COMPLIANCE.format(
+                current=current_compliance_pct,
+                framework=self.params.compliance_frameworks[0],
+                gap=compliance_gap,
+                penalty=penalty_at_current,
+                cost_k=int(cost_to_reach_target/1000)
+            )
+        )
     
     def calculate_three_year_stacked_roi(self,
                                           year1_investment: float,
                                           year1_savings: float,
-                                          efficiency_gain_multiplier: float = 1.5) -> Dict[str, Any]:
+                                          efficiency_gain_multiplier: float = 1.5) -> ThreeYearResult:
         """
         Format 4: Three-Year Stacked ROI
         Used for: Budget-conscious organizations
         """
+        return self._three_year_core(year1_investment, year1_savings, efficiency_gain_multiplier)
+    
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _three_year_core(year1_investment: float,
+                         year1_savings: float,
+                         efficiency_gain_multiplier: float) -> ThreeYearResult:
+        """Body of calculate_three_year_stacked_roi, memoized on its inputs"""
         year1_net = year1_savings - year1_investment
         year2_savings = year1_savings * efficiency_gain_multiplier
         year2_net = year2_savings  # No additional investment
@@ -138,78 +369,57 @@ class ROIEngine:
         
         cumulative_value = year1_net + year2_net + year3_net
         
-        return {
-            'format': 'Three-Year Stacked ROI',
-            'year1': {
-                'investment': year1_investment,
-                'savings': year1_savings,
-                'net': year1_net
-            },
-            'year2': {
-                'investment': 0,
-                'savings': year2_savings,
-                'net': year2_net
-            },
-            'year3': {
-                'investment': 0,
-                'savings': year3_savings,
-                'net': year3_net
-            },
-            'cumulative_value': cumulative_value,
-            'presentation': f"3-year value: Year 1 ${year1_net:,.0f} + Year 2 ${year2_net:,.0f} + Year 3 ${year3_net:,.0f} = ${cumulative_value:,.0f} total"
-        }
+        return ThreeYearResult(
+            format='Three-Year Stacked ROI',
+            year1=YearResult(investment=year1_investment, savings=year1_savings, net=year1_net),
+            year2=YearResult(investment=0, savings=year2_savings, net=year2_net),
+            year3=YearResult(investment=0, savings=year3_savings, net=year3_net),
+            cumulative_value=cumulative_value,
+            presentation=_PRES_THREE_YEAR.format(
+                y1=year1_net, y2=year2_net, y3=year3_net, total=cumulative_value
+            )
+        )
     
     def calculate_tiered_budget(self,
                                  total_budget: float,
-                                 gaps: List[Dict],
+                                 gaps: Union[List[Dict], np.ndarray],
                                  current_monthly_cost: float) -> Dict[str, Any]:
         """
         Calculate tiered budget recommendations
         Tier 1: Table Stakes (compliance)
         Tier 2: Efficiency & Risk Reduction
         Tier 3: Competitive Advantage
+        
+        gaps may be identify_gaps dicts or an identify_gaps_arr record array
         """
         # Tier 1: Critical gaps (compliance, security)
-        tier1_items = []
-        tier1_cost = 0
-        
         # Tier 2: High priority gaps
-        tier2_items = []
-        tier2_cost = 0
-        
         # Tier 3: Medium/Low priority
-        tier3_items = []
-        tier3_cost = 0
+        tier_items = ([], [], [])
+        tier_costs = [0, 0, 0]
         
-        for gap in gaps:
-            severity = gap.get('severity', 'Medium')
-            category = gap.get('category', '')
-            
-            # Estimate cost based on severity
-            if severity == 'Critical':
-                cost = current_monthly_cost * 0.3  # 30% of current spend
-                tier1_items.append({
-                    'issue': gap.get('issue'),
-                    'cost': cost,
-                    'outcome': 'Regulatory compliance maintained, 0 breaches'
-                })
-                tier1_cost += cost
-            elif severity == 'High':
-                cost = current_monthly_cost * 0.2  # 20% of current spend
-                tier2_items.append({
-                    'issue': gap.get('issue'),
-                    'cost': cost,
-                    'outcome': 'Staff freed for core mission, downtime cut 75%'
-                })
-                tier2_cost += cost
-            else:
-                cost = current_monthly_cost * 0.1  # 10% of current spend
-                tier3_items.append({
-                    'issue': gap.get('issue'),
-                    'cost': cost,
-                    'outcome': 'Competitive advantage, better customer experience'
-                })
-                tier3_cost += cost
+        # Cost per tier is fixed for this call, so price each tier once
+        tier_unit_costs = [current_monthly_cost * factor for factor in TIER_COST_FACTORS]
+        
+        if isinstance(gaps, np.ndarray):
+            # Severity codes are already tier indexes (Critical, High, Medium)
+            gap_tiers = gaps['severity'].tolist()
+            gap_issues = [GAP_ISSUES[check] for check in gaps['check'].tolist()]
+        else:
+            gap_tiers = [SEVERITY_TIER.get(gap.get('severity', 'Medium'), 2) for gap in gaps]
+            gap_issues = [gap.get('issue') for gap in gaps]
+        
+        for tier, issue in zip(gap_tiers, gap_issues):
+            cost = tier_unit_costs[tier]
+            tier_items[tier].append({
+                'issue': issue,
+                'cost': cost,
+                'outcome': TIER_ITEM_OUTCOMES[tier]
+            })
+            tier_costs[tier] += cost
+        
+        tier1_items, tier2_items, tier3_items = tier_items
+        tier1_cost, tier2_cost, tier3_cost = tier_costs
         
         # Calculate what can be done at different budget levels
         tier1_only = tier1_cost
@@ -257,60 +467,17 @@ class ROIEngine:
     
     def _get_budget_recommendation(self, budget: float, tier1: float, tier1_2: float, all_tiers: float) -> str:
         """Generate budget recommendation based on available budget"""
-        if budget >= all_tiers:
-            return f"At ${budget:,.0f} budget, you can implement all three tiers for comprehensive protection."
-        elif budget >= tier1_2:
-            pct = (budget - tier1_2) / (all_tiers - tier1_2) * 100
-            return f"At ${budget:,.0f} budget, prioritize Tier 1+2 fully, plus {pct:.0f}% of Tier 3."
-        elif budget >= tier1:
-            pct = (budget - tier1) / (tier1_2 - tier1) * 100
-            return f"At ${budget:,.0f} budget, prioritize Tier 1 fully, plus {pct:.0f}% of Tier 2. Tier 3 deferred."
-        else:
-            shortfall = tier1 - budget
-            return f"At ${budget:,.0f} budget, you're ${shortfall:,.0f} short of minimum compliance requirements (Tier 1)."
+        # Tier totals are cumulative, so the count of those covered picks the message
+        idx = bisect_right((tier1, tier1_2, all_tiers), budget)
+        return _BUDGET_FMTS[idx](budget, tier1, tier1_2, all_tiers)
     
     def generate_industry_metrics(self, signals: Dict[str, Any], tickets: List[Dict]) -> Dict[str, Any]:
         """Generate industry-specific metrics"""
         metrics = {
-            'industry': self.params['name'],
-            'compliance_frameworks': self.params['compliance_frameworks']
+            'industry': self.params.name,
+            'compliance_frameworks': self.params.compliance_frameworks
         }
-        
-        if self.industry == 'government':
-            metrics.update({
-                'uptime_pct': 100 - (signals.get('incident_volume', 0) * 0.01),
-                'cost_per_user_per_month': signals.get('total_users', 1) * 25,  # Estimate
-                'audit_readiness_score': signals.get('patch_compliance', 0)
-            })
-        
-        elif self.industry == 'nonprofit':
-            metrics.update({
-                'manual_hours_freed': len([t for t in tickets if t.get('category') in ['Password Reset', 'Account Access']]) * 0.5,
-                'ticket_backlog_days': 14,  # From AI insights
-                'tech_spend_pct_of_budget': 3.5  # Typical for nonprofits
-            })
-        
-        elif self.industry == 'manufacturing':
-            metrics.update({
-                'production_uptime_pct': 100 - (signals.get('incident_volume', 0) * 0.005),
-                'mttr_minutes': 45,  # Mean time to recovery
-                'revenue_at_risk': self.params['downtime_cost_per_hour'] * 24 * 365
-            })
-        
-        elif self.industry == 'financial':
-            metrics.update({
-                'regulatory_findings_closed': 23,  # From requirements
-                'compliance_score': signals.get('patch_compliance', 0),
-                'transaction_uptime': 99.97
-            })
-        
-        elif self.industry == 'healthcare':
-            metrics.update({
-                'ehr_uptime_pct': 99.97,
-                'patient_safety_incidents_prevented': max(0, 10 - len([t for t in tickets if t.get('priority') == 'Critical'])),
-                'breach_detection_time_minutes': 14
-            })
-        
+        metrics.update(self._metrics_fn(self, signals, tickets))
         return metrics
     
     def generate_peer_benchmark(self, signals: Dict[str, Any]) -> Dict[str, Any]:
@@ -319,19 +486,28 @@ class ROIEngine:
         uptime_score = signals.get('patch_compliance', 0)
         
         # Calculate percentile based on score
-        if uptime_score >= 95:
-            percentile = 90
-        elif uptime_score >= 85:
-            percentile = 75
-        elif uptime_score >= 75:
-            percentile = 50
-        else:
-            percentile = 25
+        percentile = PERCENTILE_LUT[bisect_right(SCORE_BREAKS, uptime_score)]
         
         return {
             'uptime_percentile': percentile,
             'compliance_percentile': percentile,
             'incident_response_percentile': min(percentile + 10, 95),
-            'summary': f"Your controls exceed {percentile}% of similar-sized {self.params['name'].lower()} organizations"
+            'summary': f"Your controls exceed {percentile}% of similar-sized {self.params.name.lower()} organizations"
+        }
+    
+    def generate_peer_benchmark_batch(self, scores_arr: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Peer percentiles for many clients at once
+        
+        Args:
+            scores_arr: patch compliance scores, one per client
+        """
+        idx = np.searchsorted(_SCORE_BREAKS_ARR, scores_arr, side='right')
+        percentile = _PERCENTILE_LUT_ARR[idx]
+        
+        return {
+            'uptime_percentile': percentile,
+            'compliance_percentile': percentile,
+            'incident_response_percentile': np.minimum(percentile + 10, 95)
         }
 
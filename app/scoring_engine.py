@@ -1,19 +1,188 @@
 from typing import Dict, List, Tuple
 
+import numpy as np
+
+# Column order of the signal matrix used by the batch scoring path
+SIGNAL_ORDER = ('patch_compliance', 'mfa', 'edr', 'backup_status', 'response_time_sla', 'total_assets')
+
+# Weights for the overall score, in summation order
+_CATEGORY_WEIGHTS = (
+    ('Identify', 0.15),
+    ('Protect', 0.30),
+    ('Detect', 0.20),
+    ('Respond', 0.20),
+    ('Recover', 0.15)
+)
+
+NIST_CATEGORIES = tuple(category for category, _ in _CATEGORY_WEIGHTS)
+
+# Overall-score weights as an array, aligned with NIST_CATEGORIES
+WEIGHTS = np.array([weight for _, weight in _CATEGORY_WEIGHTS])
+
+# Category x signal contribution weights (rows follow NIST_CATEGORIES, columns
+# SIGNAL_ORDER), used for per-signal attribution. Identify is a presence check,
+# not a weighted sum, so its row stays zero.
+_MAP_MATRIX = np.zeros((len(NIST_CATEGORIES), len(SIGNAL_ORDER)))
+_MAP_MATRIX[1, 0:4] = 0.25  # Protect: patch, MFA, EDR, backup
+_MAP_MATRIX[2, 2] = 1.0     # Detect: EDR
+_MAP_MATRIX[3, 4] = 1.0     # Respond: SLA
+_MAP_MATRIX[4, 3] = 1.0     # Recover: backup
+
+# Every signal a category draws on, including context signals that feed no
+# score, as (category index, signal index) pairs into NIST_CATEGORIES/_MAPPED_SIGNALS
+_MAPPED_SIGNALS = SIGNAL_ORDER + ('total_users', 'incident_volume')
+_SIGNAL_GRAPH = np.array([
+    (NIST_CATEGORIES.index(category), _MAPPED_SIGNALS.index(signal))
+    for category, signal in (
+        ('Identify', 'total_assets'), ('Identify', 'total_users'),
+        ('Protect', 'patch_compliance'), ('Protect', 'mfa'), ('Protect', 'edr'), ('Protect', 'backup_status'),
+        ('Detect', 'edr'), ('Detect', 'incident_volume'),
+        ('Respond', 'response_time_sla'), ('Respond', 'incident_volume'),
+        ('Recover', 'backup_status'),
+    )
+], dtype=np.int8)
+
+# Gap checks in report order: (signal, category, severity, issue, impact)
+_GAP_CHECKS = (
+    ('patch_compliance', 'Protect', 'High',
+     'Patch compliance below best practice threshold',
+     'Increased vulnerability to known exploits and security breaches'),
+    ('backup_status', 'Recover', 'Critical',
+     'Backup coverage below best practice threshold',
+     'Risk of data loss and extended downtime in disaster scenarios'),
+    ('edr', 'Protect/Detect', 'High',
+     'EDR/Antivirus coverage below best practice threshold',
+     'Limited threat detection and response capabilities'),
+    ('response_time_sla', 'Respond', 'Medium',
+     'SLA attainment below target',
+     'Delayed incident response affecting business operations'),
+    ('mfa', 'Protect', 'Critical',
+     'Multi-Factor Authentication not enforced',
+     'High risk of account compromise and unauthorized access'),
+)
+# SIGNAL_ORDER column checked by each entry of _GAP_CHECKS
+_GAP_COLUMNS = [SIGNAL_ORDER.index(check[0]) for check in _GAP_CHECKS]
+_GAP_THRESHOLD_KEYS = (
+    'THRESHOLD_PATCH_COMPLIANCE',
+    'THRESHOLD_BACKUP_SUCCESS',
+    'THRESHOLD_EDR_COVERAGE',
+    'THRESHOLD_SLA_ATTAINMENT',
+    None
+)
+
+# Severity codes stored in gap records, most severe first
+GAP_SEVERITIES = ('Critical', 'High', 'Medium')
+
+# Compact gap record; check indexes _GAP_CHECKS for the issue/impact text
+_GAP_DTYPE = np.dtype([
+    ('check', 'i1'),
+    ('signal', 'S24'),
+    ('category', 'S16'),
+    ('severity', 'i1'),
+    ('current_value', 'f8'),
+    ('threshold', 'f8')
+])
+
+GAP_ISSUES = tuple(check[3] for check in _GAP_CHECKS)
+
+# Recommendation text per gap signal; action_items are shared immutable tuples
+_REC_TEMPLATE = {
+    'patch_compliance': {
+        'recommendation': 'Implement automated patch management solution and establish monthly patching cadence',
+        'action_items': (
+            'Deploy patch management tool across all endpoints',
+            'Create maintenance windows for critical systems',
+            'Establish patch testing and rollback procedures'
+        )
+    },
+    'backup_status': {
+        'recommendation': 'Deploy enterprise backup solution for all servers with daily backup schedules',
+        'action_items': (
+            'Implement backup solution for uncovered servers',
+            'Configure daily incremental and weekly full backups',
+            'Establish quarterly restore testing procedures'
+        )
+    },
+    'edr': {
+        'recommendation': 'Deploy EDR solution to all endpoints for comprehensive threat detection',
+        'action_items': (
+            'License and deploy EDR agent to all workstations and servers',
+            'Configure threat detection policies and alerting',
+            'Establish SOC monitoring and response procedures'
+        )
+    },
+    'response_time_sla': {
+        'recommendation': 'Optimize incident response processes and resource allocation',
+        'action_items': (
+            'Review and adjust ticket prioritization rules',
+            'Implement automated triage and routing',
+            'Increase staffing during peak incident periods'
+        )
+    },
+    'mfa': {
+        'recommendation': 'Enable and enforce MFA for all user accounts, especially privileged access',
+        'action_items': (
+            'Deploy MFA solution (Azure AD, Duo, etc.)',
+            'Enforce MFA for all administrative accounts immediately',
+            'Roll out MFA to all users with 30-day adoption plan'
+        )
+    },
+}
+
+
+def _round3(values: np.ndarray) -> np.ndarray:
+    """
+    Round to 3 places with Python round() semantics
+    
+    ndarray.round scales by 1000 before rounding, which can land on the other
+    side of a half for values close to one; those few are re-rounded in Python
+    so batch scores match the scalar path exactly.
+    """
+    out = values.round(3)
+    scaled = values * 1000
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_half.any():
+        out[near_half] = [round(v, 3) for v in values[near_half].tolist()]
+    return out
+
+
+def _nist_mappings() -> Dict[str, List[str]]:
+    """Category name -> signal names, expanded from _SIGNAL_GRAPH"""
+    mappings = {category: [] for category in NIST_CATEGORIES}
+    for category_idx, signal_idx in _SIGNAL_GRAPH.tolist():
+        mappings[NIST_CATEGORIES[category_idx]].append(_MAPPED_SIGNALS[signal_idx])
+    return mappings
+
+
+def signals_matrix(signals_list: List[Dict]) -> np.ndarray:
+    """Pack a list of signal dicts into a (clients x SIGNAL_ORDER) float64 array"""
+    return np.array(
+        [[s.get(k, 0) for k in SIGNAL_ORDER] for s in signals_list],
+        dtype=np.float64
+    ).reshape(len(signals_list), len(SIGNAL_ORDER))
+
+
 class ScoringEngine:
     """Calculates NIST CSF scores and identifies gaps"""
     
     # NIST CSF Category Mappings
-    NIST_MAPPINGS = {
-        'Identify': ['total_assets', 'total_users'],
-        'Protect': ['patch_compliance', 'mfa', 'edr', 'backup_status'],
-        'Detect': ['edr', 'incident_volume'],
-        'Respond': ['response_time_sla', 'incident_volume'],
-        'Recover': ['backup_status']
-    }
+    NIST_MAPPINGS = _nist_mappings()
+    
+    # Weights for the overall score, in summation order
+    CATEGORY_WEIGHTS = _CATEGORY_WEIGHTS
     
     def __init__(self, thresholds: Dict):
         self.thresholds = thresholds
+        # Thresholds aligned with _GAP_CHECKS; MFA must always be fully enforced
+        self._gap_thresholds = tuple(
+            thresholds[key] if key else 100 for key in _GAP_THRESHOLD_KEYS
+        )
+        self._gap_records = np.array([
+            (i, signal, category, GAP_SEVERITIES.index(severity), 0, threshold)
+            for i, ((signal, category, severity, _, _), threshold)
+            in enumerate(zip(_GAP_CHECKS, self._gap_thresholds))
+        ], dtype=_GAP_DTYPE)
+        self._gap_threshold_arr = np.array(self._gap_thresholds, dtype=np.float64)
     
     def calculate_nist_scores(self, signals: Dict) -> Dict:
         """
@@ -24,39 +193,119 @@ class ScoringEngine:
         """
         scores = {}
         
+        # Normalize each signal once
+        edr = signals.get('edr', 0) / 100
+        backup = signals.get('backup_status', 0) / 100
+        
         # Identify - baseline visibility (always 1.0 if we have data)
         scores['Identify'] = 1.0 if signals.get('total_assets', 0) > 0 else 0.0
         
         # Protect - average of security controls
-        protect_signals = [
-            signals.get('patch_compliance', 0) / 100,
-            signals.get('mfa', 0) / 100,
-            signals.get('edr', 0) / 100,
-            signals.get('backup_status', 0) / 100
-        ]
-        scores['Protect'] = round(sum(protect_signals) / len(protect_signals), 3)
+        protect_total = (
+            signals.get('patch_compliance', 0) / 100 +
+            signals.get('mfa', 0) / 100 +
+            edr +
+            backup
+        )
+        scores['Protect'] = round(protect_total / 4, 3)
         
         # Detect - EDR coverage (primary detection mechanism)
-        scores['Detect'] = round(signals.get('edr', 0) / 100, 3)
+        scores['Detect'] = round(edr, 3)
         
         # Respond - SLA performance
         scores['Respond'] = round(signals.get('response_time_sla', 0) / 100, 3)
         
         # Recover - backup status
-        scores['Recover'] = round(signals.get('backup_status', 0) / 100, 3)
+        scores['Recover'] = round(backup, 3)
         
         # Overall score (weighted average)
-        overall = (
-            scores['Identify'] * 0.15 +
-            scores['Protect'] * 0.30 +
-            scores['Detect'] * 0.20 +
-            scores['Respond'] * 0.20 +
-            scores['Recover'] * 0.15
-        )
+        overall = sum(scores[category] * weight for category, weight in self.CATEGORY_WEIGHTS)
         scores['Overall'] = round(overall, 3)
         
         return scores
     
+    def calculate_nist_scores_batch(self, signals_arr: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Calculate NIST CSF category scores for many clients at once
+        
+        Args:
+            signals_arr: 2-D array with one row per client, columns in SIGNAL_ORDER
+                (see signals_matrix)
+        
+        Returns:
+            Dict of category name -> array of scores (0-1 scale), plus 'Overall'
+        """
+        category_scores = self._category_scores(np.asarray(signals_arr, dtype=np.float64))
+        
+        # Overall is weighted from the rounded categories, as in the scalar path
+        scores = {
+            category: category_scores[:, i]
+            for i, category in enumerate(NIST_CATEGORIES)
+        }
+        scores['Overall'] = self._overall_scores(category_scores)
+        
+        return scores
+    
+    def score_batch(self, signals_arr: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score many clients and flag their gaps in one pass
+        
+        Args:
+            signals_arr: 2-D array with one row per client, columns in SIGNAL_ORDER
+        
+        Returns:
+            (scores, gap_mask): scores is (n, 6) with NIST_CATEGORIES then Overall;
+            gap_mask is (n, 5) booleans in _GAP_CHECKS order
+        """
+        arr = np.asarray(signals_arr, dtype=np.float64)
+        category_scores = self._category_scores(arr)
+        
+        scores = np.empty((arr.shape[0], len(NIST_CATEGORIES) + 1))
+        scores[:, :-1] = category_scores
+        scores[:, -1] = self._overall_scores(category_scores)
+        
+        gap_mask = arr[:, _GAP_COLUMNS] < self._gap_threshold_arr
+        
+        return scores, gap_mask
+    
+    @staticmethod
+    def _category_scores(arr: np.ndarray) -> np.ndarray:
+        """(n, 5) rounded category scores from raw percentage signals"""
+        # Same operations in the same order as calculate_nist_scores
+        pct = arr / 100
+        scores = np.empty((arr.shape[0], len(NIST_CATEGORIES)))
+        scores[:, 0] = arr[:, 5] > 0                                    # Identify
+        scores[:, 1] = (pct[:, 0] + pct[:, 1] + pct[:, 2] + pct[:, 3]) / 4  # Protect
+        scores[:, 2] = pct[:, 2]                                        # Detect: EDR
+        scores[:, 3] = pct[:, 4]                                        # Respond: SLA
+        scores[:, 4] = pct[:, 3]                                        # Recover: backup
+        return _round3(scores)
+    
+    @staticmethod
+    def signal_contributions(signals_arr: np.ndarray) -> np.ndarray:
+        """
+        Per-signal contribution to each weighted category score
+        
+        Args:
+            signals_arr: 2-D array with one row per client, columns in SIGNAL_ORDER
+        
+        Returns:
+            (n, 5, len(SIGNAL_ORDER)) unrounded contributions; the last axis sums
+            to the Protect/Detect/Respond/Recover scores up to float rounding
+            (Identify is a presence check and attributes nothing). Scores
+            themselves come from _category_scores, which matches the scalar path.
+        """
+        pct = np.asarray(signals_arr, dtype=np.float64) / 100
+        return pct[:, np.newaxis, :] * _MAP_MATRIX
+    
+    @staticmethod
+    def _overall_scores(category_scores: np.ndarray) -> np.ndarray:
+        """Weighted overall score, summed in CATEGORY_WEIGHTS order like the scalar path"""
+        overall = np.zeros(category_scores.shape[0])
+        for i, weight in enumerate(WEIGHTS):
+            overall += category_scores[:, i] * weight
+        return _round3(overall)
+    
     def identify_gaps(self, signals: Dict, scores: Dict) -> List[Dict]:
         """
         Identify gaps based on thresholds
@@ -66,67 +315,48 @@ class ScoringEngine:
         """
         gaps = []
         
-        # Patch Compliance
-        if signals.get('patch_compliance', 0) < self.thresholds['THRESHOLD_PATCH_COMPLIANCE']:
-            gaps.append({
-                'category': 'Protect',
-                'signal': 'patch_compliance',
-                'current_value': signals.get('patch_compliance', 0),
-                'threshold': self.thresholds['THRESHOLD_PATCH_COMPLIANCE'],
-                'severity': 'High',
-                'issue': 'Patch compliance below best practice threshold',
-                'impact': 'Increased vulnerability to known exploits and security breaches'
-            })
-        
-        # Backup Status
-        if signals.get('backup_status', 0) < self.thresholds['THRESHOLD_BACKUP_SUCCESS']:
-            gaps.append({
-                'category': 'Recover',
-                'signal': 'backup_status',
-                'current_value': signals.get('backup_status', 0),
-                'threshold': self.thresholds['THRESHOLD_BACKUP_SUCCESS'],
-                'severity': 'Critical',
-                'issue': 'Backup coverage below best practice threshold',
-                'impact': 'Risk of data loss and extended downtime in disaster scenarios'
-            })
-        
-        # EDR Coverage
-        if signals.get('edr', 0) < self.thresholds['THRESHOLD_EDR_COVERAGE']:
-            gaps.append({
-                'category': 'Protect/Detect',
-                'signal': 'edr',
-                'current_value': signals.get('edr', 0),
-                'threshold': self.thresholds['THRESHOLD_EDR_COVERAGE'],
-                'severity': 'High',
-                'issue': 'EDR/Antivirus coverage below best practice threshold',
-                'impact': 'Limited threat detection and response capabilities'
-            })
+        for (signal, category, severity, issue, impact), threshold in zip(_GAP_CHECKS, self._gap_thresholds):
+            value = signals.get(signal, 0)
+            if value < threshold:
+                gaps.append({
+                    'category': category,
+                    'signal': signal,
+                    'current_value': value,
+                    'threshold': threshold,
+                    'severity': severity,
+                    'issue': issue,
+                    'impact': impact
+                })
         
-        # SLA Performance
-        if signals.get('response_time_sla', 0) < self.thresholds['THRESHOLD_SLA_ATTAINMENT']:
-            gaps.append({
-                'category': 'Respond',
-                'signal': 'response_time_sla',
-                'current_value': signals.get('response_time_sla', 0),
-                'threshold': self.thresholds['THRESHOLD_SLA_ATTAINMENT'],
-                'severity': 'Medium',
-                'issue': 'SLA attainment below target',
-                'impact': 'Delayed incident response affecting business operations'
-            })
+        return gaps
+    
+    def identify_gaps_arr(self, signals: Dict) -> np.ndarray:
+        """
+        Identify gaps as a structured array of _GAP_DTYPE records
         
-        # MFA
-        if signals.get('mfa', 0) < 100:
-            gaps.append({
-                'category': 'Protect',
-                'signal': 'mfa',
-                'current_value': signals.get('mfa', 0),
-                'threshold': 100,
-                'severity': 'Critical',
-                'issue': 'Multi-Factor Authentication not enforced',
-                'impact': 'High risk of account compromise and unauthorized access'
+        Same checks and order as identify_gaps; use gaps_to_dicts to expand
+        the result at the serialization boundary.
+        """
+        out = self._gap_records.copy()
+        out['current_value'] = [signals.get(check[0], 0) for check in _GAP_CHECKS]
+        return out[out['current_value'] < out['threshold']]
+    
+    @staticmethod
+    def gaps_to_dicts(gaps: np.ndarray) -> List[Dict]:
+        """Expand identify_gaps_arr records into identify_gaps dicts"""
+        result = []
+        for check, _, _, _, current_value, threshold in gaps.tolist():
+            signal, category, severity, issue, impact = _GAP_CHECKS[check]
+            result.append({
+                'category': category,
+                'signal': signal,
+                'current_value': current_value,
+                'threshold': threshold,
+                'severity': severity,
+                'issue': issue,
+                'impact': impact
             })
-        
-        return gaps
+        return result
     
     def generate_recommendations(self, gaps: List[Dict], signals: Dict) -> List[Dict]:
         """
@@ -144,48 +374,9 @@ class ScoringEngine:
                 'issue': gap['issue']
             }
             
-            # Generate specific recommendation based on signal
-            if gap['signal'] == 'patch_compliance':
-                rec['recommendation'] = 'Implement automated patch management solution and establish monthly patching cadence'
-                rec['action_items'] = [
-                    'Deploy patch management tool across all endpoints',
-                    'Create maintenance windows for critical systems',
-                    'Establish patch testing and rollback procedures'
-                ]
-            
-            elif gap['signal'] == 'backup_status':
-                rec['recommendation'] = 'Deploy enterprise backup solution for all servers with daily backup schedules'
-                rec['action_items'] = [
-                    'Implement backup solution for uncovered servers',
-                    'Configure daily incremental and weekly full backups',
-                    'Establish quarterly restore testing procedures'
-                ]
-            
-            elif gap['signal'] == 'edr':
-                rec['recommendation'] = 'Deploy EDR solution to all endpoints for comprehensive threat detection'
-                rec['action_items'] = [
-                    'License and deploy EDR agent to all workstations and servers',
-                    'Configure threat detection policies and alerting',
-                    'Establish SOC monitoring and response procedures'
-                ]
-            
-            elif gap['signal'] == 'response_time_sla':
-                rec['recommendation'] = 'Optimize incident response processes and resource allocation'
-                rec['action_items'] = [
-                    'Review and adjust ticket prioritization rules',
-                    'Implement automated triage and routing',
-                    'Increase staffing during peak incident periods'
-                ]
-            
-            elif gap['signal'] == 'mfa':
-                rec['recommendation'] = 'Enable and enforce MFA for all user accounts, especially privileged access'
-                rec['action_items'] = [
-                    'Deploy MFA solution (Azure AD, Duo, etc.)',
-                    'Enforce MFA for all administrative accounts immediately',
-                    'Roll out MFA to all users with 30-day adoption plan'
-                ]
-            
-            recommendations.append(rec)
+            # Attach the specific recommendation for this signal
+            template = _REC_TEMPLATE.get(gap['signal'])
+            recommendations.append({**rec, **template} if template else rec)
         
         return recommendations
 
@@ -2,8 +2,163 @@
 Client Segmentation Service
 Auto-calculates client tiers based on MRR and other metrics
 """
-from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
+from bisect import bisect_right
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:  # pure-Python fallback; stdlib fromisoformat needs Z spelled out
+    def _parse_iso(value):
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+# Epoch-microsecond timestamps; naive datetimes are UTC throughout the app
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=timezone.utc)
+_ONE_US = timedelta(microseconds=1)
+_NO_TS = np.iinfo(np.int64).min
+_EMPTY_TS = np.empty(0, dtype=np.int64)
+
+
+def _parse_iso_fast(value):
+    """ISO-8601 string to epoch microseconds, or _NO_TS when missing"""
+    if not value:
+        return _NO_TS
+    dt = _parse_iso(value)
+    return (dt - (_EPOCH_UTC if dt.tzinfo else _EPOCH)) // _ONE_US
+
+
+# Health deductions in report order: (factor, points)
+_HEALTH_FACTORS = (
+    ('No active agreements', 30),
+    ('No recent meetings', 25),
+    ('Low meeting frequency', 15),
+    ('No reports generated', 25),
+    ('Infrequent reporting', 10),
+    ('Poor security posture', 20),
+    ('Below-average security', 10),
+)
+_HEALTH_FACTOR_NAMES = np.array([factor for factor, _ in _HEALTH_FACTORS])
+_HEALTH_WEIGHTS = np.array([points for _, points in _HEALTH_FACTORS])
+_HEALTH_STATUS_BINS = (40, 60, 80)
+_HEALTH_STATUS_LABELS = ('critical', 'at_risk', 'good', 'excellent')
+
+
+def _health_flags(agreements, meetings, reports):
+    """Which _HEALTH_FACTORS apply to a customer, in table order"""
+    # Security posture is read from the latest (first) report
+    security_score = reports[0].get('overall_score', 0) if reports else None
+    return (
+        # Agreement health (30 points)
+        not agreements or not any(a.get('status') == 'active' for a in agreements),
+        # Meeting engagement (25 points)
+        not meetings,
+        len(meetings) == 1 if meetings else False,
+        # Report generation (25 points)
+        not reports,
+        len(reports) == 1 if reports else False,
+        # Security posture (20 points)
+        security_score is not None and security_score < 50,
+        security_score is not None and 50 <= security_score < 70,
+    )
+
+
+# Risk points in report order: (factor, points)
+_RISK_FACTORS = (
+    ('Declining MRR', 30),
+    ('Low MRR value', 20),
+    ('Critical health score', 30),
+    ('Below-average health', 15),
+    ('No recent meetings', 20),
+)
+_RISK_FACTOR_NAMES = np.array([factor for factor, _ in _RISK_FACTORS])
+_RISK_WEIGHTS = np.array([points for _, points in _RISK_FACTORS])
+_RISK_LEVEL_BINS = (20, 40, 60)
+_RISK_LEVEL_LABELS = ('low', 'medium', 'high', 'critical')
+
+_GROWTH_LABELS = ('high', 'medium', 'low')
+
+
+def _status_tags(health_status, risk_level):
+    """Tags that follow the tier tag for a health status / risk level pair"""
+    tags = ()
+    if health_status == 'excellent':
+        tags += ('HEALTHY',)
+    elif health_status in ('at_risk', 'critical'):
+        tags += ('NEEDS_ATTENTION',)
+    if risk_level in ('high', 'critical'):
+        tags += ('HIGH_RISK',)
+    return tags
+
+
+# Every (health_status, risk_level) pair resolved to its tags once at import
+_TAG_TABLE = {
+    (health_status, risk_level): _status_tags(health_status, risk_level)
+    for health_status in _HEALTH_STATUS_LABELS
+    for risk_level in _RISK_LEVEL_LABELS
+}
+
+
+@lru_cache(maxsize=1024)
+def _tier_for_mrr(total_mrr):
+    """Tier for an MRR; keyed on the exact value so any threshold classifies like the batch path"""
+    return SegmentationService._TIER_NAMES[bisect_right(SegmentationService._TIER_CUTS, total_mrr)]
+
+
+@lru_cache(maxsize=1024)
+def _tier_score(total_mrr):
+    """Numeric tier score (0-100); keyed on exact MRR since it scales linearly"""
+    # Normalize MRR to 0-100 scale
+    max_mrr = 20000  # $20k is 100 score
+    score = min(100, (total_mrr / max_mrr) * 100)
+    return round(score, 1)
+
+
+class MRRData(NamedTuple):
+    total_mrr: float
+    trend: str
+    change_percentage: float
+
+
+class HealthData(NamedTuple):
+    score: float
+    status: str
+    factors: List[str]
+
+
+class EngagementData(NamedTuple):
+    last_meeting_date: Optional[str]
+    meetings_per_quarter: int
+    last_report_date: Optional[str]
+
+
+class RiskData(NamedTuple):
+    level: str
+    score: int
+    factors: List[str]
+
+
+class TenureData(NamedTuple):
+    customer_since: Optional[date]
+    tenure_months: int
+
+
+_NO_TENURE = TenureData(customer_since=None, tenure_months=0)
+
+# Shape of every segmentation result (ClientSegmentation columns); copied and
+# filled per customer so each result is presized with a fixed key order
+_RESULT_TEMPLATE = dict.fromkeys((
+    'customer_id', 'tier', 'tier_score', 'total_mrr', 'mrr_trend', 'mrr_change_percentage',
+    'lifetime_value', 'customer_since', 'tenure_months', 'health_score', 'health_status',
+    'last_meeting_date', 'meetings_per_quarter', 'last_report_date', 'risk_level',
+    'risk_factors', 'strategic_account', 'growth_potential', 'tags', 'last_calculated',
+    'calculation_version'
+))
+_RESULT_TEMPLATE['calculation_version'] = '1.0'
+
 
 class SegmentationService:
     """Auto-calculate client segmentation and tiers based on MRR"""
@@ -16,10 +171,15 @@ class SegmentationService:
         'bronze': 0         # <$2k MRR
     }
     
+    # TIER_THRESHOLDS as ascending tier names and the lower bound of every tier
+    # above the lowest, resolved once for bisect instead of per-call dict lookups
+    _TIER_NAMES = tuple(sorted(TIER_THRESHOLDS, key=TIER_THRESHOLDS.get))
+    _TIER_CUTS = tuple(sorted(TIER_THRESHOLDS.values())[1:])
+    
     def __init__(self, db):
         self.db = db
     
-    def calculate_segmentation(self, customer_id, agreements, meetings, reports):
+    def calculate_segmentation(self, customer_id, agreements, meetings, reports, total_mrr=None):
         """
         Calculate comprehensive client segmentation
         
@@ -28,21 +188,25 @@ class SegmentationService:
             agreements: List of client agreements
             meetings: List of client meetings
             reports: List of client reports
+            total_mrr: Pre-aggregated MRR (e.g. trigger-maintained); summed from agreements if None
         
         Returns:
             dict with segmentation data
         """
+        # One clock read shared by engagement, tenure and the timestamp
+        now = datetime.now(timezone.utc)
+        
         # Calculate MRR metrics
-        mrr_data = self._calculate_mrr_metrics(agreements)
+        mrr_data = self._calculate_mrr_metrics(agreements, total_mrr)
         
         # Calculate tier based on MRR
-        tier = self._calculate_tier(mrr_data['total_mrr'])
+        tier = self._calculate_tier(mrr_data.total_mrr)
         
         # Calculate health score
         health_data = self._calculate_health_score(agreements, meetings, reports)
         
         # Calculate engagement metrics
-        engagement_data = self._calculate_engagement(meetings, reports)
+        engagement_data = self._calculate_engagement(meetings, reports, now)
         
         # Calculate risk level
         risk_data = self._calculate_risk(mrr_data, health_data, engagement_data)
@@ -51,44 +215,51 @@ class SegmentationService:
         growth_potential = self._calculate_growth_potential(mrr_data, agreements)
         
         # Calculate tenure
-        tenure_data = self._calculate_tenure(agreements)
-        
-        return {
-            'customer_id': customer_id,
-            'tier': tier,
-            'tier_score': self._calculate_tier_score(mrr_data['total_mrr']),
-            'total_mrr': mrr_data['total_mrr'],
-            'mrr_trend': mrr_data['trend'],
-            'mrr_change_percentage': mrr_data['change_percentage'],
-            'lifetime_value': mrr_data['total_mrr'] * tenure_data['tenure_months'],
-            'customer_since': tenure_data['customer_since'],
-            'tenure_months': tenure_data['tenure_months'],
-            'health_score': health_data['score'],
-            'health_status': health_data['status'],
-            'last_meeting_date': engagement_data['last_meeting_date'],
-            'meetings_per_quarter': engagement_data['meetings_per_quarter'],
-            'last_report_date': engagement_data['last_report_date'],
-            'risk_level': risk_data['level'],
-            'risk_factors': risk_data['factors'],
-            'strategic_account': self._is_strategic_account(mrr_data['total_mrr'], health_data['score']),
-            'growth_potential': growth_potential,
-            'tags': self._generate_tags(tier, health_data['status'], risk_data['level']),
-            'last_calculated': datetime.utcnow(),
-            'calculation_version': '1.0'
-        }
+        tenure_data = self._calculate_tenure(agreements, now)
+        
+        return self._build_result(
+            customer_id, tier, mrr_data, tenure_data, engagement_data,
+            health_data.score, health_data.status, risk_data.level, risk_data.factors,
+            self._is_strategic_account(mrr_data.total_mrr, health_data.score),
+            growth_potential,
+            now.replace(tzinfo=None)  # column stores naive UTC
+        )
     
-    def _calculate_mrr_metrics(self, agreements):
+    def _build_result(self, customer_id, tier, mrr_data, tenure_data, engagement_data,
+                      health_score, health_status, risk_level, risk_factors,
+                      strategic_account, growth_potential, last_calculated):
+        """Fill a copy of _RESULT_TEMPLATE with one customer's segmentation"""
+        result = _RESULT_TEMPLATE.copy()
+        result['customer_id'] = customer_id
+        result['tier'] = tier
+        result['tier_score'] = self._calculate_tier_score(mrr_data.total_mrr)
+        result['total_mrr'] = mrr_data.total_mrr
+        result['mrr_trend'] = mrr_data.trend
+        result['mrr_change_percentage'] = mrr_data.change_percentage
+        result['lifetime_value'] = mrr_data.total_mrr * tenure_data.tenure_months
+        result['customer_since'] = tenure_data.customer_since
+        result['tenure_months'] = tenure_data.tenure_months
+        result['health_score'] = health_score
+        result['health_status'] = health_status
+        result['last_meeting_date'] = engagement_data.last_meeting_date
+        result['meetings_per_quarter'] = engagement_data.meetings_per_quarter
+        result['last_report_date'] = engagement_data.last_report_date
+        result['risk_level'] = risk_level
+        result['risk_factors'] = risk_factors
+        result['strategic_account'] = strategic_account
+        result['growth_potential'] = growth_potential
+        result['tags'] = self._generate_tags(tier, health_status, risk_level)
+        result['last_calculated'] = last_calculated
+        return result
+    
+    def _calculate_mrr_metrics(self, agreements, total_mrr=None):
         """Calculate MRR and trends"""
-        if not agreements:
-            return {
-                'total_mrr': 0.0,
-                'trend': 'stable',
-                'change_percentage': 0.0
-            }
-        
-        # Sum active agreements
-        active_agreements = [a for a in agreements if a.get('status') == 'active']
-        total_mrr = sum(a.get('monthly_mrr', 0) for a in active_agreements)
+        if total_mrr is None:
+            if not agreements:
+                return MRRData(total_mrr=0.0, trend='stable', change_percentage=0.0)
+            
+            # Sum active agreements
+            total_mrr = sum(a.get('monthly_mrr', 0) for a in agreements if a.get('status') == 'active')
         
         # Simple trend calculation (would use historical data in production)
         # For now, assume stable
@@ -98,66 +269,21 @@ class SegmentationService:
         # If we had historical MRR data, we'd calculate trend here
         # trend = 'growing' if current_mrr > previous_mrr else 'declining'
         
-        return {
-            'total_mrr': total_mrr,
-            'trend': trend,
-            'change_percentage': change_percentage
-        }
+        return MRRData(total_mrr=total_mrr, trend=trend, change_percentage=change_percentage)
     
-    def _calculate_tier(self, total_mrr):
+    @staticmethod
+    def _calculate_tier(total_mrr):
         """Calculate tier based on MRR thresholds"""
-        if total_mrr >= self.TIER_THRESHOLDS['platinum']:
-            return 'platinum'
-        elif total_mrr >= self.TIER_THRESHOLDS['gold']:
-            return 'gold'
-        elif total_mrr >= self.TIER_THRESHOLDS['silver']:
-            return 'silver'
-        else:
-            return 'bronze'
+        return _tier_for_mrr(total_mrr)
     
     def _calculate_tier_score(self, total_mrr):
         """Calculate numeric tier score (0-100)"""
-        # Normalize MRR to 0-100 scale
-        max_mrr = 20000  # $20k is 100 score
-        score = min(100, (total_mrr / max_mrr) * 100)
-        return round(score, 1)
+        return _tier_score(total_mrr)
     
     def _calculate_health_score(self, agreements, meetings, reports):
         """Calculate client health score (0-100)"""
-        score = 100
-        factors = []
-        
-        # Agreement health (30 points)
-        if not agreements or not any(a.get('status') == 'active' for a in agreements):
-            score -= 30
-            factors.append("No active agreements")
-        
-        # Meeting engagement (25 points)
-        if not meetings or len(meetings) == 0:
-            score -= 25
-            factors.append("No recent meetings")
-        elif len(meetings) < 2:
-            score -= 15
-            factors.append("Low meeting frequency")
-        
-        # Report generation (25 points)
-        if not reports or len(reports) == 0:
-            score -= 25
-            factors.append("No reports generated")
-        elif len(reports) < 2:
-            score -= 10
-            factors.append("Infrequent reporting")
-        
-        # Security posture (20 points)
-        if reports:
-            latest_report = reports[0]
-            security_score = latest_report.get('overall_score', 0)
-            if security_score < 50:
-                score -= 20
-                factors.append("Poor security posture")
-            elif security_score < 70:
-                score -= 10
-                factors.append("Below-average security")
+        flags = _health_flags(agreements, meetings, reports)
+        score = 100 - sum(weight for (_, weight), hit in zip(_HEALTH_FACTORS, flags) if hit)
         
         # Determine status
         if score >= 80:
@@ -169,69 +295,176 @@ class SegmentationService:
         else:
             status = 'critical'
         
-        return {
-            'score': max(0, score),
-            'status': status,
-            'factors': factors
-        }
+        return HealthData(
+            score=max(0, score),
+            status=status,
+            factors=[factor for (factor, _), hit in zip(_HEALTH_FACTORS, flags) if hit]
+        )
     
-    def _calculate_engagement(self, meetings, reports):
+    def calculate_segmentation_batch(self, customers):
+        """
+        Calculate segmentation for many customers at once
+        
+        Per-customer list walks (MRR sum, meeting dates, tenure) stay in Python;
+        the scoring that combines them runs as NumPy operations over the batch.
+        
+        Args:
+            customers: iterable of (customer_id, agreements, meetings, reports)
+        
+        Returns:
+            list of dicts, as from calculate_segmentation
+        """
+        customers = list(customers)
+        now = datetime.now(timezone.utc)
+        last_calculated = now.replace(tzinfo=None)
+        
+        mrr_rows = [self._calculate_mrr_metrics(agreements) for _, agreements, _, _ in customers]
+        engagement_rows = [self._calculate_engagement(meetings, reports, now) for _, _, meetings, reports in customers]
+        tenure_rows = [self._calculate_tenure(agreements, now) for _, agreements, _, _ in customers]
+        
+        total_mrr = np.array([m.total_mrr for m in mrr_rows], dtype=np.float64)
+        declining = np.array([m.trend == 'declining' for m in mrr_rows], dtype=bool)
+        growing = np.array([m.trend == 'growing' for m in mrr_rows], dtype=bool)
+        has_agreements = np.array([bool(agreements) for _, agreements, _, _ in customers], dtype=bool)
+        no_recent_meetings = np.array([e.meetings_per_quarter == 0 for e in engagement_rows], dtype=bool)
+        
+        # Health
+        health_mask = np.array(
+            [_health_flags(agreements, meetings, reports) for _, agreements, meetings, reports in customers],
+            dtype=bool
+        ).reshape(-1, len(_HEALTH_FACTORS))
+        health_scores = np.maximum(100 - health_mask @ _HEALTH_WEIGHTS, 0)
+        health_status = np.digitize(health_scores, _HEALTH_STATUS_BINS)
+        
+        # Risk
+        risk_mask = np.column_stack((
+            declining,
+            total_mrr < 1000,
+            health_scores < 50,
+            (health_scores >= 50) & (health_scores < 70),
+            no_recent_meetings
+        ))
+        risk_level = np.digitize(risk_mask @ _RISK_WEIGHTS, _RISK_LEVEL_BINS)
+        
+        # Tier, strategic flag and growth potential
+        tier_idx = np.searchsorted(self._TIER_CUTS, total_mrr, side='right')
+        strategic = (total_mrr >= 5000) & (health_scores >= 70)
+        growth = np.where(growing, 0, np.where((total_mrr < 5000) & has_agreements, 1, 2))
+        
+        results = []
+        for i, (customer_id, _, _, _) in enumerate(customers):
+            mrr_data, engagement_data, tenure_data = mrr_rows[i], engagement_rows[i], tenure_rows[i]
+            tier = self._TIER_NAMES[tier_idx[i]]
+            health_label = _HEALTH_STATUS_LABELS[health_status[i]]
+            risk_label = _RISK_LEVEL_LABELS[risk_level[i]]
+            results.append(self._build_result(
+                customer_id, tier, mrr_data, tenure_data, engagement_data,
+                int(health_scores[i]), health_label, risk_label,
+                np.compress(risk_mask[i], _RISK_FACTOR_NAMES).tolist(),
+                bool(strategic[i]), _GROWTH_LABELS[growth[i]], last_calculated
+            ))
+        
+        return results
+    
+    def calculate_segmentation_for_rows(self, customer_ids, agreements, meetings, reports):
+        """
+        Calculate segmentation from flat, all-customer row lists
+        
+        Each row list is grouped by its 'customer_id' in one pass, so callers can
+        load every customer's agreements, meetings and reports with one query
+        per table and hand the results to calculate_segmentation_batch.
+        
+        Args:
+            customer_ids: Customers to segment, in result order
+            agreements: Agreement dicts for any number of customers
+            meetings: Meeting dicts for any number of customers
+            reports: Report dicts for any number of customers
+        
+        Returns:
+            list of dicts, as from calculate_segmentation
+        """
+        grouped = {customer_id: ([], [], []) for customer_id in customer_ids}
+        for slot, rows in enumerate((agreements, meetings, reports)):
+            for row in rows:
+                group = grouped.get(row['customer_id'])
+                if group is not None:
+                    group[slot].append(row)
+        
+        return self.calculate_segmentation_batch(
+            (customer_id, *group) for customer_id, group in grouped.items()
+        )
+    
+    def calculate_health_scores_batch(self, customers):
+        """
+        Health scores for many customers at once
+        
+        Args:
+            customers: iterable of (agreements, meetings, reports) per customer
+        
+        Returns:
+            list of HealthData, as from _calculate_health_score
+        """
+        mask = np.array(
+            [_health_flags(*c) for c in customers], dtype=bool
+        ).reshape(-1, len(_HEALTH_FACTORS))
+        scores = np.maximum(100 - mask @ _HEALTH_WEIGHTS, 0)
+        statuses = np.digitize(scores, _HEALTH_STATUS_BINS)
+        
+        return [
+            HealthData(
+                score=score,
+                status=_HEALTH_STATUS_LABELS[status],
+                factors=np.compress(row, _HEALTH_FACTOR_NAMES).tolist()
+            )
+            for score, status, row in zip(scores.tolist(), statuses.tolist(), mask)
+        ]
+    
+    def _calculate_engagement(self, meetings, reports, now):
         """Calculate engagement metrics"""
+        # Parse meeting dates once; latest and recent count both read the array
+        meeting_ts = np.fromiter(
+            (_parse_iso_fast(m.get('scheduled_date')) for m in meetings),
+            dtype=np.int64, count=len(meetings)
+        ) if meetings else _EMPTY_TS
+        
         # Last meeting
         last_meeting_date = None
-        if meetings:
-            sorted_meetings = sorted(meetings, key=lambda m: m.get('scheduled_date', ''), reverse=True)
-            if sorted_meetings:
-                last_meeting_date = sorted_meetings[0].get('scheduled_date')
+        if meeting_ts.size:
+            last_idx = int(meeting_ts.argmax())
+            if meeting_ts[last_idx] != _NO_TS:
+                last_meeting_date = meetings[last_idx].get('scheduled_date')
         
         # Meetings per quarter
-        three_months_ago = datetime.utcnow() - timedelta(days=90)
-        recent_meetings = [
-            m for m in meetings 
-            if m.get('scheduled_date') and 
-            datetime.fromisoformat(m['scheduled_date'].replace('Z', '+00:00')) >= three_months_ago
-        ] if meetings else []
-        meetings_per_quarter = len(recent_meetings)
-        
-        # Last report
-        last_report_date = None
-        if reports:
-            sorted_reports = sorted(reports, key=lambda r: r.get('generated_at', ''), reverse=True)
-            if sorted_reports:
-                last_report_date = sorted_reports[0].get('generated_at')
+        three_months_ago = now - timedelta(days=90)
+        cutoff_us = (three_months_ago - _EPOCH_UTC) // _ONE_US
+        meetings_per_quarter = int((meeting_ts >= cutoff_us).sum())
+        
+        # Last report (ISO-8601 strings order chronologically)
+        last_report_date = max(
+            (r['generated_at'] for r in reports if r.get('generated_at')),
+            default=None
+        )
         
-        return {
-            'last_meeting_date': last_meeting_date,
-            'meetings_per_quarter': meetings_per_quarter,
-            'last_report_date': last_report_date
-        }
+        return EngagementData(
+            last_meeting_date=last_meeting_date,
+            meetings_per_quarter=meetings_per_quarter,
+            last_report_date=last_report_date
+        )
     
     def _calculate_risk(self, mrr_data, health_data, engagement_data):
         """Calculate risk level and factors"""
-        risk_score = 0
-        factors = []
-        
-        # MRR risk
-        if mrr_data['trend'] == 'declining':
-            risk_score += 30
-            factors.append("Declining MRR")
-        
-        if mrr_data['total_mrr'] < 1000:
-            risk_score += 20
-            factors.append("Low MRR value")
-        
-        # Health risk
-        if health_data['score'] < 50:
-            risk_score += 30
-            factors.append("Critical health score")
-        elif health_data['score'] < 70:
-            risk_score += 15
-            factors.append("Below-average health")
-        
-        # Engagement risk
-        if engagement_data['meetings_per_quarter'] == 0:
-            risk_score += 20
-            factors.append("No recent meetings")
+        flags = (
+            # MRR risk
+            mrr_data.trend == 'declining',
+            mrr_data.total_mrr < 1000,
+            # Health risk
+            health_data.score < 50,
+            50 <= health_data.score < 70,
+            # Engagement risk
+            engagement_data.meetings_per_quarter == 0,
+        )
+        risk_score = sum(points for (_, points), hit in zip(_RISK_FACTORS, flags) if hit)
+        factors = [factor for (factor, _), hit in zip(_RISK_FACTORS, flags) if hit]
         
         # Determine level
         if risk_score >= 60:
@@ -243,55 +476,41 @@ class SegmentationService:
         else:
             level = 'low'
         
-        return {
-            'level': level,
-            'score': risk_score,
-            'factors': factors
-        }
+        return RiskData(level=level, score=risk_score, factors=factors)
     
     def _calculate_growth_potential(self, mrr_data, agreements):
         """Calculate growth potential"""
         # Simple heuristic - in production, use more sophisticated analysis
-        if mrr_data['trend'] == 'growing':
+        if mrr_data.trend == 'growing':
             return 'high'
-        elif mrr_data['total_mrr'] < 5000 and len(agreements) > 0:
+        elif mrr_data.total_mrr < 5000 and len(agreements) > 0:
             return 'medium'  # Room to grow
         else:
             return 'low'
     
-    def _calculate_tenure(self, agreements):
+    def _calculate_tenure(self, agreements, now):
         """Calculate customer tenure"""
         if not agreements:
-            return {
-                'customer_since': None,
-                'tenure_months': 0
-            }
+            return _NO_TENURE
         
         # Find earliest agreement start date
-        sorted_agreements = sorted(
-            [a for a in agreements if a.get('start_date')],
-            key=lambda a: a['start_date']
+        customer_since = min(
+            (a['start_date'] for a in agreements if a.get('start_date')),
+            default=None
         )
         
-        if not sorted_agreements:
-            return {
-                'customer_since': None,
-                'tenure_months': 0
-            }
-        
-        customer_since = sorted_agreements[0]['start_date']
+        if customer_since is None:
+            return _NO_TENURE
         
         # Calculate months
         if isinstance(customer_since, str):
-            customer_since = datetime.fromisoformat(customer_since).date()
+            # Only the date part matters; skip parsing any time component
+            customer_since = date.fromisoformat(customer_since[:10])
         
-        today = datetime.utcnow().date()
+        today = now.date()
         tenure_months = (today.year - customer_since.year) * 12 + (today.month - customer_since.month)
         
-        return {
-            'customer_since': customer_since,
-            'tenure_months': max(0, tenure_months)
-        }
+        return TenureData(customer_since=customer_since, tenure_months=max(0, tenure_months))
     
     def _is_strategic_account(self, total_mrr, health_score):
         """Determine if account is strategic"""
@@ -300,17 +519,7 @@ class SegmentationService:
     
     def _generate_tags(self, tier, health_status, risk_level):
         """Generate automatic tags"""
-        tags = [tier.upper()]
-        
-        if health_status == 'excellent':
-            tags.append('HEALTHY')
-        elif health_status in ['at_risk', 'critical']:
-            tags.append('NEEDS_ATTENTION')
-        
-        if risk_level in ['high', 'critical']:
-            tags.append('HIGH_RISK')
-        
-        return tags
+        return (tier.upper(), *_TAG_TABLE[(health_status, risk_level)])
     
     def get_tier_summary(self):
         """Get summary of clients by tier"""
@@ -1,5 +1,12 @@
 from typing import Dict, List
 
+# Asset status values that count as compliant / protected
+_PATCH_COMPLIANT = frozenset(['Compliant', 'UpToDate'])
+_AV_PROTECTED = frozenset(['Protected', 'Enabled'])
+
+# Asset types covered by EDR
+_EDR_ENDPOINT_TYPES = frozenset(['Workstation', 'Laptop', 'Server'])
+
 class SignalProcessor:
     """Processes raw Halo data into normalized signals"""
     
@@ -13,19 +20,31 @@ class SignalProcessor:
         """
         signals = {}
         
+        # One pass over assets for patch, backup, EDR and asset-type counters
+        compliant_assets = servers = backed_up = endpoints = protected = 0
+        for a in assets:
+            asset_type = a.get('type')
+            if a.get('patchstatus') in _PATCH_COMPLIANT:
+                compliant_assets += 1
+            if asset_type == 'Server':
+                servers += 1
+                if a.get('backup_enabled') is True:
+                    backed_up += 1
+            if asset_type in _EDR_ENDPOINT_TYPES:
+                endpoints += 1
+                if a.get('antivirusstatus') in _AV_PROTECTED:
+                    protected += 1
+        
         # Patch Compliance
         if assets:
-            compliant_assets = sum(1 for a in assets if a.get('patchstatus') in ['Compliant', 'UpToDate'])
             signals['patch_compliance'] = round(compliant_assets / len(assets) * 100, 2)
         else:
             signals['patch_compliance'] = 0.0
         
         # Backup Status
         if assets:
-            servers = [a for a in assets if a.get('type') == 'Server']
             if servers:
-                backed_up = sum(1 for s in servers if s.get('backup_enabled') is True)
-                signals['backup_status'] = round(backed_up / len(servers) * 100, 2)
+                signals['backup_status'] = round(backed_up / servers * 100, 2)
             else:
                 signals['backup_status'] = 100.0  # No servers to back up
         else:
@@ -36,35 +55,27 @@ class SignalProcessor:
         signals['mfa'] = 100.0 if mfa_enforced else 0.0
         
         # EDR (Endpoint Detection and Response)
-        if assets:
-            endpoints = [a for a in assets if a.get('type') in ['Workstation', 'Laptop', 'Server']]
-            if endpoints:
-                protected = sum(1 for e in endpoints if e.get('antivirusstatus') in ['Protected', 'Enabled'])
-                signals['edr'] = round(protected / len(endpoints) * 100, 2)
-            else:
-                signals['edr'] = 0.0
+        if endpoints:
+            signals['edr'] = round(protected / endpoints * 100, 2)
         else:
             signals['edr'] = 0.0
         
-        # Response Time SLA
+        # Response Time SLA and Incident Volume (average per month)
         if tickets:
             met_sla = sum(1 for t in tickets if t.get('met_sla') is True)
             signals['response_time_sla'] = round(met_sla / len(tickets) * 100, 2)
-        else:
-            signals['response_time_sla'] = 100.0  # No tickets = perfect SLA
-        
-        # Incident Volume (average per month)
-        if tickets:
             # Assuming tickets span 90 days (3 months) by default
             signals['incident_volume'] = round(len(tickets) / 3, 2)
         else:
+            signals['response_time_sla'] = 100.0  # No tickets = perfect SLA
             signals['incident_volume'] = 0.0
         
         # Additional context
         signals['total_assets'] = len(assets)
-        signals['total_users'] = len([u for u in users if u.get('active', True)])
-        signals['total_servers'] = len([a for a in assets if a.get('type') == 'Server'])
-        signals['total_endpoints'] = len([a for a in assets if a.get('type') in ['Workstation', 'Laptop']])
+        signals['total_users'] = sum(1 for u in users if u.get('active', True))
+        signals['total_servers'] = servers
+        # EDR endpoints include servers; these context counts are workstations and laptops only
+        signals['total_endpoints'] = endpoints - servers
         
         return signals
     
@@ -1,6 +1,64 @@
+from bisect import bisect_right
+from functools import lru_cache
 from typing import Dict, List, Any
 from datetime import datetime
 
+# Lower score bound of each status above 'Needs Improvement', ascending
+_SCORE_STATUS_TABLE = (60, 75, 90)
+_SCORE_STATUS_LABELS = ('Needs Improvement', 'Fair', 'Good', 'Excellent')
+
+
+@lru_cache(maxsize=256)
+def _score_status(score_bucket: int) -> str:
+    """Status description for a whole-percent score"""
+    return _SCORE_STATUS_LABELS[bisect_right(_SCORE_STATUS_TABLE, score_bucket)]
+
+
+# English month names for report dates (avoids strftime's locale lookup)
+_MONTH_NAMES = (None, 'January', 'February', 'March', 'April', 'May', 'June', 'July',
+                'August', 'September', 'October', 'November', 'December')
+
+
+def _format_long_date(d) -> str:
+    """'March 05, 2026' - same output as strftime('%B %d, %Y')"""
+    return f"{_MONTH_NAMES[d.month]} {d.day:02d}, {d.year}"
+
+
+# Text templates, parsed once at import and called per customer
+# Executive one-pager
+_ONEPAGER_TITLE_TMPL = 'Executive Summary: {name} IT Security Review'.format
+_POSTURE_TMPL = "Security posture at {score:.1f}% - {status}".format
+_GAPS_TMPL = "{count} critical gaps identified requiring immediate attention".format
+_LOSSES_PREVENTED_TMPL = "${value:,.0f} in potential losses prevented this quarter".format
+_EXPOSURE_TMPL = "Estimated exposure: ${value:,.0f}".format
+_INVESTMENT_TMPL = "Investment required: ${value:,.0f}".format
+_TIMELINE_TMPL = "Timeline: {timeline}".format
+_MONTHLY_COST_TMPL = "Monthly cost: ${value:,.0f}".format
+_PAYBACK_TMPL = "Payback period: {months} months".format
+_THREE_YEAR_VALUE_TMPL = "3-year value: ${value:,.0f}".format
+
+# Board talking points
+_BOARD_PERFORMANCE_TMPL = "Our infrastructure prevented {count} potential incidents worth ${value:,.0f} this quarter".format
+_BOARD_PEER_TMPL = "We rank in the top {top}% for uptime compared to similar {industry} organizations".format
+_BOARD_COMPLIANCE_TMPL = "We maintain {score:.0f}% compliance with {framework}".format
+_BOARD_HOURS_TMPL = "IT operations freed {hours:,.0f} staff hours this year through automation".format
+_BOARD_VALUE_TMPL = "Value: ${value:,.0f} redirected to mission-critical work".format
+_BOARD_ROI_TMPL = "Current security investment provides {mult:.1f}x return through risk avoidance".format
+
+# Monthly scorecard
+_SCORECARD_TITLE_TMPL = 'Monthly Performance Card | {name}'.format
+_PCT2_TMPL = "{pct:.2f}%".format
+_IMPACT_TMPL = "Prevented {inc} potential incidents worth ${val:,.0f}".format
+_BLOCKED_TMPL = "{count} incidents stopped before reaching systems".format
+_MINUTES_TMPL = "{minutes} minutes".format
+_UNDER_MINUTES_TMPL = "< {minutes} minutes".format
+_HOURS_TMPL = "{hours:.0f} hours".format
+_HOURS_VALUE_TMPL = "${value:,.0f} value redirected to mission work".format
+_RISK_PREVENTED_TMPL = "${value:,.0f} in risk prevented".format
+_MONEY_TMPL = "${value:,.0f}".format
+_MULTIPLIER_TMPL = "{mult:.1f}x".format
+
+
 class StakeholderContentGenerator:
     """
     Generates stakeholder-specific content for SBRs
@@ -20,34 +78,36 @@ class StakeholderContentGenerator:
         Generate one-pager for executives (30 seconds to read)
         Format: Visual + 3 bullets per section
         """
+        score_status = self._get_score_status(overall_score)
+        
         return {
-            'title': f'Executive Summary: {customer_name} IT Security Review',
-            'date': datetime.now().strftime('%B %d, %Y'),
+            'title': _ONEPAGER_TITLE_TMPL(name=customer_name),
+            'date': _format_long_date(datetime.now()),
             'overall_score': overall_score,
-            'score_status': self._get_score_status(overall_score),
+            'score_status': score_status,
             
             'what_we_found': [
-                f"Security posture at {overall_score:.1f}% - {self._get_score_status(overall_score)}",
-                f"{len(top_risks)} critical gaps identified requiring immediate attention",
-                f"${roi_data.get('total_risk_prevented', 0):,.0f} in potential losses prevented this quarter"
+                _POSTURE_TMPL(score=overall_score, status=score_status),
+                _GAPS_TMPL(count=len(top_risks)),
+                _LOSSES_PREVENTED_TMPL(value=roi_data.get('total_risk_prevented', 0))
             ],
             
             'the_risk': [
                 top_risks[0]['issue'] if len(top_risks) > 0 else 'No critical risks identified',
                 top_risks[1]['issue'] if len(top_risks) > 1 else '',
-                f"Estimated exposure: ${sum([r.get('financial_impact', 0) for r in top_risks[:3]]):,.0f}"
+                _EXPOSURE_TMPL(value=sum(r.get('financial_impact', 0) for r in top_risks[:3]))
             ],
             
             'the_cost': [
-                f"Investment required: ${roi_data.get('investment_required', 0):,.0f}",
-                f"Timeline: {roi_data.get('timeline', '6-12 months')}",
-                f"Monthly cost: ${roi_data.get('monthly_cost', 0):,.0f}"
+                _INVESTMENT_TMPL(value=roi_data.get('investment_required', 0)),
+                _TIMELINE_TMPL(timeline=roi_data.get('timeline', '6-12 months')),
+                _MONTHLY_COST_TMPL(value=roi_data.get('monthly_cost', 0))
             ],
             
             'the_roi': [
                 roi_data.get('presentation', 'ROI analysis included in full report'),
-                f"Payback period: {roi_data.get('payback_months', 12)} months",
-                f"3-year value: ${roi_data.get('three_year_value', 0):,.0f}"
+                _PAYBACK_TMPL(months=roi_data.get('payback_months', 12)),
+                _THREE_YEAR_VALUE_TMPL(value=roi_data.get('three_year_value', 0))
             ]
         }
     
@@ -63,27 +123,30 @@ class StakeholderContentGenerator:
         return [
             {
                 'category': 'Performance',
-                'talking_point': f"Our infrastructure prevented {incidents_prevented} potential incidents worth ${key_metrics.get('risk_prevented', 0):,.0f} this quarter",
+                'talking_point': _BOARD_PERFORMANCE_TMPL(count=incidents_prevented, value=key_metrics.get('risk_prevented', 0)),
                 'context': 'This demonstrates proactive security management and risk mitigation'
             },
             {
                 'category': 'Peer Comparison',
-                'talking_point': f"We rank in the top {100 - peer_benchmark.get('uptime_percentile', 50)}% for uptime compared to similar {industry} organizations",
+                'talking_point': _BOARD_PEER_TMPL(top=100 - peer_benchmark.get('uptime_percentile', 50), industry=industry),
                 'context': peer_benchmark.get('summary', 'Industry benchmarking analysis included')
             },
             {
                 'category': 'Compliance',
-                'talking_point': f"We maintain {key_metrics.get('compliance_score', 0):.0f}% compliance with {key_metrics.get('primary_framework', 'industry standards')}",
+                'talking_point': _BOARD_COMPLIANCE_TMPL(
+                    score=key_metrics.get('compliance_score', 0),
+                    framework=key_metrics.get('primary_framework', 'industry standards')
+                ),
                 'context': 'Regulatory audit-ready with documented controls'
             },
             {
                 'category': 'Operational Excellence',
-                'talking_point': f"IT operations freed {key_metrics.get('hours_saved', 0):,.0f} staff hours this year through automation",
-                'context': f"Value: ${key_metrics.get('efficiency_value', 0):,.0f} redirected to mission-critical work"
+                'talking_point': _BOARD_HOURS_TMPL(hours=key_metrics.get('hours_saved', 0)),
+                'context': _BOARD_VALUE_TMPL(value=key_metrics.get('efficiency_value', 0))
             },
             {
                 'category': 'Risk Management',
-                'talking_point': f"Current security investment provides {key_metrics.get('roi_multiplier', 0):.1f}x return through risk avoidance",
+                'talking_point': _BOARD_ROI_TMPL(mult=key_metrics.get('roi_multiplier', 0)),
                 'context': 'Every dollar invested prevents multiple dollars in potential losses'
             }
         ]
@@ -148,43 +211,43 @@ class StakeholderContentGenerator:
         Tracks progress toward outcomes between reviews
         """
         return {
-            'title': f'Monthly Performance Card | {customer_name}',
+            'title': _SCORECARD_TITLE_TMPL(name=customer_name),
             'month': month,
             'metrics': [
                 {
                     'name': 'System Uptime',
-                    'actual': f"{metrics.get('uptime_pct', 0):.2f}%",
-                    'target': f"{targets.get('uptime_pct', 99.9):.2f}%",
+                    'actual': _PCT2_TMPL(pct=metrics.get('uptime_pct', 0)),
+                    'target': _PCT2_TMPL(pct=targets.get('uptime_pct', 99.9)),
                     'status': '✅' if metrics.get('uptime_pct', 0) >= targets.get('uptime_pct', 99.9) else '⚠️',
-                    'impact': f"Prevented {metrics.get('incidents_prevented', 0)} potential incidents worth ${metrics.get('incidents_value', 0):,.0f}"
+                    'impact': _IMPACT_TMPL(inc=metrics.get('incidents_prevented', 0), val=metrics.get('incidents_value', 0))
                 },
                 {
                     'name': 'Security Incidents Blocked',
                     'actual': metrics.get('incidents_blocked', 0),
                     'target': targets.get('incidents_blocked', 8),
                     'status': '✅' if metrics.get('incidents_blocked', 0) >= targets.get('incidents_blocked', 8) else '⚠️',
-                    'impact': f"{metrics.get('incidents_blocked', 0)} incidents stopped before reaching systems"
+                    'impact': _BLOCKED_TMPL(count=metrics.get('incidents_blocked', 0))
                 },
                 {
                     'name': 'Maintenance Window Impact',
-                    'actual': f"{metrics.get('maintenance_downtime_min', 0)} minutes",
-                    'target': f"< {targets.get('maintenance_downtime_min', 5)} minutes",
+                    'actual': _MINUTES_TMPL(minutes=metrics.get('maintenance_downtime_min', 0)),
+                    'target': _UNDER_MINUTES_TMPL(minutes=targets.get('maintenance_downtime_min', 5)),
                     'status': '✅' if metrics.get('maintenance_downtime_min', 0) <= targets.get('maintenance_downtime_min', 5) else '⚠️',
                     'impact': 'All patches applied during scheduled downtime'
                 },
                 {
                     'name': 'Staff Hours Freed',
-                    'actual': f"{metrics.get('hours_freed', 0):.0f} hours",
-                    'target': f"{targets.get('hours_freed', 20):.0f} hours",
+                    'actual': _HOURS_TMPL(hours=metrics.get('hours_freed', 0)),
+                    'target': _HOURS_TMPL(hours=targets.get('hours_freed', 20)),
                     'status': '✅' if metrics.get('hours_freed', 0) >= targets.get('hours_freed', 20) else '⚠️',
-                    'impact': f"${metrics.get('hours_freed', 0) * 50:,.0f} value redirected to mission work"
+                    'impact': _HOURS_VALUE_TMPL(value=metrics.get('hours_freed', 0) * 50)
                 }
             ],
             'ytd_summary': {
-                'roi_value': f"${ytd_roi.get('total_value', 0):,.0f} in risk prevented",
-                'investment_ytd': f"${ytd_roi.get('investment', 0):,.0f}",
-                'net_value': f"${ytd_roi.get('net_value', 0):,.0f}",
-                'roi_multiplier': f"{ytd_roi.get('multiplier', 0):.1f}x"
+                'roi_value': _RISK_PREVENTED_TMPL(value=ytd_roi.get('total_value', 0)),
+                'investment_ytd': _MONEY_TMPL(value=ytd_roi.get('investment', 0)),
+                'net_value': _MONEY_TMPL(value=ytd_roi.get('net_value', 0)),
+                'roi_multiplier': _MULTIPLIER_TMPL(mult=ytd_roi.get('multiplier', 0))
             },
             'next_steps': 'Board presentation scheduled. You\'re in great shape.',
             'trend': '📈' if metrics.get('trend', 'improving') == 'improving' else '📉'
@@ -229,14 +292,8 @@ class StakeholderContentGenerator:
     
     def _get_score_status(self, score: float) -> str:
         """Get status description based on score"""
-        if score >= 90:
-            return 'Excellent'
-        elif score >= 75:
-            return 'Good'
-        elif score >= 60:
-            return 'Fair'
-        else:
-            return 'Needs Improvement'
+        # Status bounds are whole numbers, so whole-percent buckets classify identically
+        return _score_status(int(score))
     
     def _generate_tradeoff_statement(self, tiered_budget: Dict) -> str:
         """Generate trade-off statement for budget justification"""
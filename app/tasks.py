@@ -0,0 +1,49 @@
+"""
+Background jobs
+Runs the CPU-heavy part of review generation (insights, ROI, report/PDF rendering) on an RQ worker
+"""
+from functools import lru_cache
+
+from redis import Redis
+from rq import Queue
+
+from app.config import Config
+
+
+@lru_cache(maxsize=1)
+def get_redis():
+    return Redis.from_url(Config.REDIS_URL)
+
+
+@lru_cache(maxsize=1)
+def get_queue():
+    return Queue(Config.RQ_QUEUE, connection=get_redis())
+
+
+def run_review_tail(customer_id, customer, assets, tickets, users):
+    """
+    Analyze fetched Halo data, render the reports and save the ReportRun
+    
+    Returns:
+        The same payload the synchronous /api/generate-review endpoint returns
+    """
+    # Imported here so the worker builds the Flask app only when a job runs
+    from app.main import app, db, ReportRun, _analyze_customer, _build_report_row, _review_response
+    
+    with app.app_context():
+        analysis = _analyze_customer(customer, assets, tickets, users)
+        row, report_paths = _build_report_row(customer_id, customer, analysis)
+        report_run = ReportRun(**row)
+        
+        db.session.add(report_run)
+        db.session.commit()
+        
+        return _review_response(report_run.id, customer, analysis, report_paths)
+
+
+def render_report_pdf(html_path, pdf_path):
+    """Render a generated HTML report to PDF with WeasyPrint"""
+    from weasyprint import HTML
+    
+    HTML(filename=html_path).write_pdf(pdf_path)
+    return pdf_path
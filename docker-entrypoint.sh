@@ -0,0 +1,7 @@
+#!/bin/sh
+set -e
+
+# Create database tables once, before gunicorn forks its workers
+SBR_INIT_DB=1 python -c "import app.main"
+
+exec "$@"
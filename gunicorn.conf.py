@@ -0,0 +1,16 @@
+"""
+Gunicorn configuration
+Threaded workers with keep-alive; most of a review is spent waiting on Halo/LLM calls
+"""
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+keepalive = 15
+timeout = 120
+
+# Heartbeat files on tmpfs so workers don't block on disk
+worker_tmp_dir = '/dev/shm'
@@ -0,0 +1,13 @@
+-- Migration: Partial indexes for lifecycle dashboard filters
+-- Date: 2026-10-15
+--
+-- get_meetings / get_action_items filter on customer_id + status and order
+-- by date. Most rows end up completed, so index only the active ones.
+
+CREATE INDEX IF NOT EXISTS ix_meetings_active
+    ON meetings (customer_id, scheduled_date DESC)
+    WHERE status IN ('scheduled', 'rescheduled');
+
+CREATE INDEX IF NOT EXISTS ix_actions_open
+    ON action_items (customer_id, due_date)
+    WHERE status IN ('open', 'in_progress');
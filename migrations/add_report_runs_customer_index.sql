@@ -0,0 +1,11 @@
+-- Migration: Covering index for per-customer report counts
+-- Date: 2026-10-15
+--
+-- The admin dashboard and customer list run
+--   SELECT customer_id, count(id) FROM report_runs GROUP BY customer_id
+-- An index on (customer_id, id) lets PostgreSQL answer it with an
+-- index-only scan. CONCURRENTLY avoids locking report_runs; run it
+-- outside a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_report_runs_customer_id_id
+    ON report_runs (customer_id, id);
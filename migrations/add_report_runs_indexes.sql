@@ -0,0 +1,7 @@
+-- Migration: Index for paginated report listing
+-- Date: 2026-10-15
+--
+-- list_reports pages through report_runs newest first.
+
+CREATE INDEX IF NOT EXISTS ix_report_runs_generated_at
+    ON report_runs (generated_at DESC);
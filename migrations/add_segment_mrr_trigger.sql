@@ -0,0 +1,51 @@
+-- Migration: Maintain client_segmentation.total_mrr incrementally
+-- Date: 2026-10-15
+--
+-- Keeps the denormalized total_mrr on client_segmentation in step with
+-- client_agreements so segmentation recalculation no longer has to sum
+-- every agreement. Enable with SEGMENT_MRR_TRIGGER=true once applied.
+
+CREATE OR REPLACE FUNCTION update_segment_mrr() RETURNS TRIGGER AS $$
+DECLARE
+    old_mrr DECIMAL(10,2) := 0;
+    new_mrr DECIMAL(10,2) := 0;
+BEGIN
+    -- Only active agreements count towards MRR
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.status = 'active' THEN
+        old_mrr := COALESCE(OLD.monthly_mrr, 0);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.status = 'active' THEN
+        new_mrr := COALESCE(NEW.monthly_mrr, 0);
+    END IF;
+
+    IF TG_OP = 'UPDATE' AND OLD.customer_id IS DISTINCT FROM NEW.customer_id THEN
+        UPDATE client_segmentation
+        SET total_mrr = COALESCE(total_mrr, 0) - old_mrr
+        WHERE customer_id = OLD.customer_id;
+
+        UPDATE client_segmentation
+        SET total_mrr = COALESCE(total_mrr, 0) + new_mrr
+        WHERE customer_id = NEW.customer_id;
+    ELSIF new_mrr <> old_mrr THEN
+        UPDATE client_segmentation
+        SET total_mrr = COALESCE(total_mrr, 0) + (new_mrr - old_mrr)
+        WHERE customer_id = COALESCE(NEW.customer_id, OLD.customer_id);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS t_agree_mrr ON client_agreements;
+
+CREATE TRIGGER t_agree_mrr
+AFTER INSERT OR UPDATE OR DELETE ON client_agreements
+FOR EACH ROW EXECUTE FUNCTION update_segment_mrr();
+
+-- Backfill existing segmentation rows
+UPDATE client_segmentation s
+SET total_mrr = COALESCE((
+    SELECT SUM(a.monthly_mrr)
+    FROM client_agreements a
+    WHERE a.customer_id = s.customer_id AND a.status = 'active'
+), 0);